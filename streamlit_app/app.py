@@ -1,543 +1,923 @@
-"""
-FDA Data Intelligence Dashboard
-
-A Streamlit dashboard that uses FDA data from Fivetran + BigQuery
-and leverages Google Cloud AI (Vertex AI) for intelligent insights.
-"""
-
-import streamlit as st
-import pandas as pd
-from google.cloud import bigquery
-from google.cloud import aiplatform
-import vertexai
-from vertexai.generative_models import GenerativeModel, Part
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
-import os
-
-# Page configuration
-st.set_page_config(
-    page_title="FDA Intelligence Dashboard",
-    page_icon="💊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS for better UI
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .insight-box {
-        background-color: #e8f4f8;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1f77b4;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #fff3cd;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #ffc107;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-class FDADashboard:
-    """Main dashboard class"""
-    
-    def __init__(self):
-        """Initialize dashboard with Google Cloud connections"""
-        self.bq_client = None
-        self.vertex_model = None
-        self.project_id = None
-        self.dataset_id = None
-        
-    def setup_google_cloud(self, project_id: str, dataset_id: str, location: str = "us-central1"):
-        """
-        Setup Google Cloud connections
-        
-        Args:
-            project_id: GCP project ID
-            dataset_id: BigQuery dataset ID
-            location: GCP region
-        """
-        try:
-            # Initialize BigQuery client
-            self.bq_client = bigquery.Client(project=project_id)
-            self.project_id = project_id
-            self.dataset_id = dataset_id
-            
-            # Initialize Vertex AI
-            vertexai.init(project=project_id, location=location)
-            self.vertex_model = GenerativeModel("gemini-1.5-flash")
-            
-            st.success("✅ Connected to Google Cloud successfully!")
-            return True
-            
-        except Exception as e:
-            st.error(f"❌ Error connecting to Google Cloud: {str(e)}")
-            return False
-    
-    def query_bigquery(self, query: str) -> pd.DataFrame:
-        """
-        Execute BigQuery query
-        
-        Args:
-            query: SQL query string
-            
-        Returns:
-            DataFrame with results
-        """
-        try:
-            df = self.bq_client.query(query).to_dataframe()
-            return df
-        except Exception as e:
-            st.error(f"Error querying BigQuery: {str(e)}")
-            return pd.DataFrame()
-    
-    def get_adverse_events_summary(self, table_name: str = "fda_drug_adverse_events") -> pd.DataFrame:
-        """Get summary of drug adverse events"""
-        query = f"""
-        SELECT 
-            COUNT(*) as total_events,
-            COUNT(DISTINCT safetyreportid) as unique_reports,
-            COUNTIF(serious = '1') as serious_events,
-            COUNTIF(serious_death = '1') as deaths,
-            COUNTIF(serious_hospitalization = '1') as hospitalizations
-        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-        """
-        return self.query_bigquery(query)
-    
-    def get_top_drugs_by_events(self, table_name: str = "fda_drug_adverse_events", limit: int = 10) -> pd.DataFrame:
-        """Get drugs with most adverse events"""
-        query = f"""
-        WITH drug_events AS (
-            SELECT 
-                REGEXP_EXTRACT(drug_names, r"'([^']+)'") as drug_name,
-                safetyreportid,
-                serious
-            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-            WHERE drug_names != '[]'
-        )
-        SELECT 
-            drug_name,
-            COUNT(*) as event_count,
-            COUNTIF(serious = '1') as serious_count
-        FROM drug_events
-        WHERE drug_name IS NOT NULL AND drug_name != ''
-        GROUP BY drug_name
-        ORDER BY event_count DESC
-        LIMIT {limit}
-        """
-        return self.query_bigquery(query)
-    
-    def get_events_by_date(self, table_name: str = "fda_drug_adverse_events") -> pd.DataFrame:
-        """Get events timeline"""
-        query = f"""
-        SELECT 
-            PARSE_DATE('%Y%m%d', receivedate) as event_date,
-            COUNT(*) as event_count,
-            COUNTIF(serious = '1') as serious_count
-        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-        WHERE LENGTH(receivedate) = 8 AND receivedate != ''
-        GROUP BY event_date
-        ORDER BY event_date DESC
-        LIMIT 365
-        """
-        return self.query_bigquery(query)
-    
-    def get_recalls_summary(self, table_name: str = "fda_drug_recalls") -> pd.DataFrame:
-        """Get recalls summary"""
-        query = f"""
-        SELECT 
-            classification,
-            COUNT(*) as recall_count,
-            COUNT(DISTINCT company_name) as companies_affected
-        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-        WHERE classification IS NOT NULL
-        GROUP BY classification
-        ORDER BY recall_count DESC
-        """
-        return self.query_bigquery(query)
-    
-    def get_recent_recalls(self, table_name: str = "fda_drug_recalls", limit: int = 10) -> pd.DataFrame:
-        """Get recent recalls"""
-        query = f"""
-        SELECT 
-            recall_number,
-            report_date,
-            product_description,
-            reason_for_recall,
-            company_name,
-            classification,
-            status
-        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-        ORDER BY report_date DESC
-        LIMIT {limit}
-        """
-        return self.query_bigquery(query)
-    
-    def analyze_with_gemini(self, data_summary: str, question: str) -> str:
-        """
-        Use Vertex AI Gemini to analyze data and answer questions
-        
-        Args:
-            data_summary: Summary of the data
-            question: User's question
-            
-        Returns:
-            AI-generated insight
-        """
-        try:
-            prompt = f"""
-You are an FDA data analyst with expertise in drug safety and public health.
-
-Data Summary:
-{data_summary}
-
-User Question: {question}
-
-Provide a detailed, actionable insight based on the data. Include:
-1. Key findings
-2. Potential concerns or trends
-3. Recommendations for healthcare providers or patients
-4. Any patterns that warrant further investigation
-
-Keep your response professional, data-driven, and focused on public health impact.
-"""
-            
-            response = self.vertex_model.generate_content(prompt)
-            return response.text
-            
-        except Exception as e:
-            return f"Error generating AI insight: {str(e)}"
-    
-    def get_ai_safety_recommendations(self, drug_name: str, adverse_events: pd.DataFrame) -> str:
-        """Get AI-powered safety recommendations for a drug"""
-        
-        events_summary = adverse_events.to_string() if not adverse_events.empty else "No data available"
-        
-        prompt = f"""
-Analyze the adverse event data for {drug_name}:
-
-{events_summary}
-
-Provide:
-1. Risk assessment summary
-2. Most concerning adverse events
-3. Patient populations who should be cautious
-4. Recommendations for healthcare providers
-5. Suggested monitoring parameters
-
-Be concise but thorough.
-"""
-        
-        try:
-            response = self.vertex_model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error: {str(e)}"
-
-
-def main():
-    """Main application"""
-    
-    # Header
-    st.markdown('<h1 class="main-header">💊 FDA Intelligence Dashboard</h1>', unsafe_allow_html=True)
-    st.markdown("**Powered by Fivetran, Google Cloud BigQuery & Vertex AI**")
-    st.markdown("---")
-    
-    # Initialize dashboard
-    dashboard = FDADashboard()
-    
-    # Sidebar configuration
-    st.sidebar.title("⚙️ Configuration")
-    
-    project_id = st.sidebar.text_input(
-        "GCP Project ID",
-        value=os.environ.get("GCP_PROJECT_ID", ""),
-        help="Your Google Cloud Project ID"
-    )
-    
-    dataset_id = st.sidebar.text_input(
-        "BigQuery Dataset ID",
-        value=os.environ.get("BQ_DATASET_ID", "fda_data"),
-        help="BigQuery dataset where Fivetran syncs FDA data"
-    )
-    
-    location = st.sidebar.selectbox(
-        "GCP Region",
-        ["us-central1", "us-east1", "us-west1", "europe-west1", "asia-east1"],
-        help="Google Cloud region"
-    )
-    
-    # Connect button
-    if st.sidebar.button("🔌 Connect to Google Cloud", type="primary"):
-        if project_id and dataset_id:
-            dashboard.setup_google_cloud(project_id, dataset_id, location)
-        else:
-            st.sidebar.error("Please provide Project ID and Dataset ID")
-    
-    # Main content
-    if dashboard.bq_client is None:
-        st.info("👈 Please configure and connect to Google Cloud in the sidebar to begin")
-        
-        # Setup instructions
-        st.markdown("## 🚀 Quick Start")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            ### 1️⃣ Setup Fivetran Connector
-            - Deploy FDA connector to Fivetran
-            - Connect to BigQuery destination
-            - Start syncing FDA data
-            """)
-        
-        with col2:
-            st.markdown("""
-            ### 2️⃣ Configure Dashboard
-            - Enter GCP Project ID
-            - Specify BigQuery dataset
-            - Click Connect
-            """)
-        
-        return
-    
-    # Dashboard tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Overview",
-        "⚠️ Adverse Events",
-        "🔄 Recalls",
-        "🤖 AI Insights"
-    ])
-    
-    # Tab 1: Overview
-    with tab1:
-        st.header("Dashboard Overview")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # Get summary data
-        summary = dashboard.get_adverse_events_summary()
-        
-        if not summary.empty:
-            with col1:
-                st.metric(
-                    "Total Events",
-                    f"{summary['total_events'].iloc[0]:,}"
-                )
-            
-            with col2:
-                st.metric(
-                    "Serious Events",
-                    f"{summary['serious_events'].iloc[0]:,}",
-                    delta=f"{(summary['serious_events'].iloc[0] / summary['total_events'].iloc[0] * 100):.1f}%"
-                )
-            
-            with col3:
-                st.metric(
-                    "Deaths Reported",
-                    f"{summary['deaths'].iloc[0]:,}"
-                )
-            
-            with col4:
-                st.metric(
-                    "Hospitalizations",
-                    f"{summary['hospitalizations'].iloc[0]:,}"
-                )
-        
-        st.markdown("---")
-        
-        # Timeline
-        st.subheader("📈 Events Timeline")
-        events_timeline = dashboard.get_events_by_date()
-        
-        if not events_timeline.empty:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=events_timeline['event_date'],
-                y=events_timeline['event_count'],
-                name='All Events',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig.add_trace(go.Scatter(
-                x=events_timeline['event_date'],
-                y=events_timeline['serious_count'],
-                name='Serious Events',
-                line=dict(color='#ff7f0e', width=2)
-            ))
-            fig.update_layout(
-                title='Adverse Events Over Time',
-                xaxis_title='Date',
-                yaxis_title='Number of Events',
-                hovermode='x unified',
-                height=400
-            )
-            st.plotly_chart(fig, use_container_width=True)
-    
-    # Tab 2: Adverse Events
-    with tab2:
-        st.header("⚠️ Adverse Events Analysis")
-        
-        # Top drugs
-        st.subheader("Top Drugs by Adverse Events")
-        top_drugs = dashboard.get_top_drugs_by_events(limit=15)
-        
-        if not top_drugs.empty:
-            fig = px.bar(
-                top_drugs,
-                x='event_count',
-                y='drug_name',
-                orientation='h',
-                color='serious_count',
-                title='Drugs with Most Reported Adverse Events',
-                labels={'event_count': 'Total Events', 'drug_name': 'Drug Name', 'serious_count': 'Serious Events'},
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Data table
-            st.subheader("Detailed Data")
-            st.dataframe(top_drugs, use_container_width=True)
-    
-    # Tab 3: Recalls
-    with tab3:
-        st.header("🔄 Drug Recalls")
-        
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            st.subheader("Recalls by Classification")
-            recalls_summary = dashboard.get_recalls_summary()
-            
-            if not recalls_summary.empty:
-                fig = px.pie(
-                    recalls_summary,
-                    values='recall_count',
-                    names='classification',
-                    title='Recall Distribution',
-                    color_discrete_sequence=px.colors.sequential.RdBu
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.subheader("Recent Recalls")
-            recent_recalls = dashboard.get_recent_recalls()
-            
-            if not recent_recalls.empty:
-                for _, recall in recent_recalls.iterrows():
-                    with st.expander(f"🔴 {recall['product_description'][:100]}..."):
-                        st.markdown(f"""
-                        **Recall Number:** {recall['recall_number']}  
-                        **Date:** {recall['report_date']}  
-                        **Company:** {recall['company_name']}  
-                        **Classification:** {recall['classification']}  
-                        **Status:** {recall['status']}  
-                        **Reason:** {recall['reason_for_recall']}
-                        """)
-    
-    # Tab 4: AI Insights
-    with tab4:
-        st.header("🤖 AI-Powered Insights")
-        st.markdown("*Powered by Google Vertex AI Gemini*")
-        
-        # Question answering
-        st.subheader("Ask Questions About FDA Data")
-        
-        user_question = st.text_input(
-            "What would you like to know?",
-            placeholder="e.g., What are the most concerning drug safety trends?"
-        )
-        
-        if st.button("🔍 Get AI Insight", type="primary"):
-            if user_question:
-                with st.spinner("Analyzing data with AI..."):
-                    # Get relevant data
-                    summary = dashboard.get_adverse_events_summary()
-                    top_drugs = dashboard.get_top_drugs_by_events()
-                    
-                    data_summary = f"""
-                    Total Events: {summary['total_events'].iloc[0] if not summary.empty else 0}
-                    Serious Events: {summary['serious_events'].iloc[0] if not summary.empty else 0}
-                    Deaths: {summary['deaths'].iloc[0] if not summary.empty else 0}
-                    
-                    Top Drugs by Events:
-                    {top_drugs.to_string() if not top_drugs.empty else 'No data'}
-                    """
-                    
-                    insight = dashboard.analyze_with_gemini(data_summary, user_question)
-                    
-                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-                    st.markdown("### 💡 AI Insight")
-                    st.markdown(insight)
-                    st.markdown('</div>', unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Drug-specific analysis
-        st.subheader("Drug Safety Analysis")
-        
-        drug_name = st.text_input("Enter drug name for detailed analysis")
-        
-        if st.button("📊 Analyze Drug", type="secondary"):
-            if drug_name:
-                with st.spinner(f"Analyzing {drug_name}..."):
-                    # Query specific drug data
-                    query = f"""
-                    SELECT 
-                        reactions,
-                        serious,
-                        serious_death,
-                        serious_hospitalization,
-                        patient_sex,
-                        patient_age
-                    FROM `{dashboard.project_id}.{dashboard.dataset_id}.fda_drug_adverse_events`
-                    WHERE LOWER(drug_names) LIKE LOWER('%{drug_name}%')
-                    LIMIT 100
-                    """
-                    
-                    drug_data = dashboard.query_bigquery(query)
-                    
-                    if not drug_data.empty:
-                        recommendations = dashboard.get_ai_safety_recommendations(drug_name, drug_data)
-                        
-                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
-                        st.markdown(f"### ⚠️ Safety Analysis: {drug_name}")
-                        st.markdown(recommendations)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    else:
-                        st.warning(f"No data found for {drug_name}")
-    
-    # Footer
-    st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666;'>
-        <p>Built for the Fivetran × Google Cloud Challenge 2024</p>
-        <p>Data source: openFDA | Powered by Fivetran, BigQuery & Vertex AI</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-
-if __name__ == "__main__":
-    main()
-
-
+"""
+FDA Data Intelligence Dashboard
+
+A Streamlit dashboard that uses FDA data from Fivetran + BigQuery
+and leverages Google Cloud AI (Vertex AI) for intelligent insights.
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+import json
+import os
+
+# The Google Cloud and Plotly imports are deferred to first use: they
+# cost multiple seconds of cold-start and the unconnected landing screen
+# needs none of them
+
+# Page configuration
+st.set_page_config(
+    page_title="FDA Intelligence Dashboard",
+    page_icon="💊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS for better UI
+
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Static style block, built once and reused across reruns."""
+    return """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .insight-box {
+        background-color: #e8f4f8;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #1f77b4;
+        margin: 1rem 0;
+    }
+    .warning-box {
+        background-color: #fff3cd;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #ffc107;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_bq_client(project_id: str):
+    """Create one BigQuery client per project and reuse it across reruns"""
+    from google.cloud import bigquery
+    return bigquery.Client(project=project_id)
+
+
+@st.cache_resource(show_spinner=False)
+def get_bqstorage_client():
+    """BigQuery Storage read client for fast Arrow downloads (optional)"""
+    try:
+        from google.cloud import bigquery_storage
+        return bigquery_storage.BigQueryReadClient()
+    except ImportError:
+        return None
+
+
+def _submit_with_ctx(executor, fn, *args, **kwargs):
+    """Submit fn to the executor with the Streamlit script-run context
+
+    Worker threads have no ScriptRunContext, so any st.* call they make
+    (error reporting in particular) is silently dropped; attaching the
+    caller's context keeps those elements visible.
+    """
+    import threading
+    from streamlit.runtime.scriptrunner import (add_script_run_ctx,
+                                                get_script_run_ctx)
+
+    ctx = get_script_run_ctx()
+
+    def _call():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+
+    return executor.submit(_call)
+
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_model(model_name: str = "gemini-1.5-flash"):
+    """Build the Gemini model handle once per session"""
+    from vertexai.generative_models import GenerativeModel
+    return GenerativeModel(model_name)
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _generate_insight(prompt: str, model_name: str = "gemini-1.5-flash") -> str:
+    """
+    Call Gemini, cached on the prompt text
+
+    Users frequently re-ask the same question over the same data; a
+    cache hit skips seconds of model latency and the token cost.
+    """
+    return get_gemini_model(model_name).generate_content(prompt).text
+
+
+@st.cache_resource(show_spinner=False)
+def _insight_cache() -> dict:
+    """
+    Process-wide prompt -> response cache for streamed Gemini calls
+
+    Users re-ask the same questions over unchanged aggregates; a hit
+    skips the full model round-trip. A plain dict behind
+    cache_resource (rather than cache_data on the call) lets the
+    streaming path populate it chunk by chunk.
+    """
+    return {}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_query(project_id: str, query: str, use_bqstorage: bool = True,
+               params: tuple = ()) -> pd.DataFrame:
+    """
+    Execute a BigQuery query, cached on the SQL string
+
+    Streamlit reruns the whole script on every interaction; caching here
+    means each distinct query pays the BigQuery round-trip once per hour
+    instead of once per rerun. Row-heavy results are downloaded through
+    the Storage API's Arrow streams when available, which is an order of
+    magnitude faster than REST pagination; callers fetching one-row
+    aggregates pass use_bqstorage=False to skip its setup overhead.
+    """
+    from google.cloud import bigquery
+
+    bqstorage_client = get_bqstorage_client() if use_bqstorage else None
+    client = get_bq_client(project_id)
+    job_config = bigquery.QueryJobConfig(
+        use_query_cache=True,
+        query_parameters=[
+            bigquery.ScalarQueryParameter(name, type_, value)
+            for name, type_, value in params
+        ]
+    )
+    try:
+        # query_and_wait prefers the short-query jobs.query RPC
+        # internally, answering small dashboard aggregates without
+        # jobs.insert + polling
+        rows = client.query_and_wait(query, job_config=job_config)
+    except AttributeError:
+        # Older client library without the short-query path
+        rows = client.query(query, job_config=job_config)
+    # Arrow-backed dtypes let Streamlit's Arrow serializer ship the
+    # frame zero-copy instead of re-encoding numpy object columns
+    table = rows.to_arrow(
+        bqstorage_client=bqstorage_client,
+        create_bqstorage_client=False
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+class FDADashboard:
+    """Main dashboard class"""
+    
+    def __init__(self):
+        """Initialize dashboard with Google Cloud connections"""
+        self.bq_client = None
+        self.vertex_model = None
+        self.project_id = None
+        self.dataset_id = None
+        
+    def setup_google_cloud(self, project_id: str, dataset_id: str, location: str = "us-central1"):
+        """
+        Setup Google Cloud connections
+        
+        Args:
+            project_id: GCP project ID
+            dataset_id: BigQuery dataset ID
+            location: GCP region
+        """
+        try:
+            # Initialize BigQuery client (shared across reruns)
+            self.bq_client = get_bq_client(project_id)
+            self.project_id = project_id
+            self.dataset_id = dataset_id
+            
+            # Initialize Vertex AI
+            import vertexai
+            vertexai.init(project=project_id, location=location)
+            self.vertex_model = get_gemini_model()
+
+            # Make sure the UNNEST-able view over the raw table exists
+            self.ensure_flat_drug_view()
+
+            # Materialized rollups keep dashboard reads at O(days) rows
+            self.ensure_rollup_views()
+
+            # Search index turns drug-name lookups from full scans into
+            # index probes
+            self.ensure_search_index()
+
+            st.success("✅ Connected to Google Cloud successfully!")
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ Error connecting to Google Cloud: {str(e)}")
+            return False
+    
+    def query_bigquery(self, query: str, use_bqstorage: bool = True,
+                       params: tuple = ()) -> pd.DataFrame:
+        """
+        Execute BigQuery query
+
+        Args:
+            query: SQL query string
+            use_bqstorage: Download via the Storage API; disable for
+                one-row aggregates where its setup outweighs the gain
+            params: Scalar query parameters as (name, type, value) tuples
+
+        Returns:
+            DataFrame with results
+
+        Errors are caught here, outside the cache, so a transient
+        failure is never memoized as an empty result
+        """
+        try:
+            return _run_query(self.project_id, query, use_bqstorage, params)
+        except Exception as e:
+            st.error(f"Error querying BigQuery: {str(e)}")
+            return pd.DataFrame()
+    
+    def ensure_flat_drug_view(self, table_name: str = "fda_drug_adverse_events"):
+        """
+        Create a view exposing drug_names/reactions as real arrays
+
+        The landed columns are serialized lists, which forced per-row
+        REGEXP_EXTRACT at query time and silently kept only the first
+        drug of each report. The view parses them once into
+        ARRAY<STRING> so aggregations can CROSS JOIN UNNEST instead.
+        """
+        query = f"""
+        CREATE VIEW IF NOT EXISTS `{self.project_id}.{self.dataset_id}.{table_name}_flat` AS
+        SELECT
+            * EXCEPT (drug_names, reactions),
+            COALESCE(
+                JSON_EXTRACT_STRING_ARRAY(drug_names),
+                JSON_EXTRACT_STRING_ARRAY(REPLACE(drug_names, "'", '"'))
+            ) as drug_names,
+            COALESCE(
+                JSON_EXTRACT_STRING_ARRAY(reactions),
+                JSON_EXTRACT_STRING_ARRAY(REPLACE(reactions, "'", '"'))
+            ) as reactions
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        """
+        try:
+            self.bq_client.query(query).result()
+        except Exception as e:
+            st.warning(f"Could not create flat view: {str(e)}")
+
+    def ensure_rollup_views(self, events_table: str = "fda_drug_adverse_events",
+                            recalls_table: str = "fda_drug_recalls"):
+        """
+        Create materialized rollups for the timeline and recall summary
+
+        The daily and per-classification aggregates scanned the full
+        tables on every dashboard load; BigQuery refreshes these views
+        incrementally as Fivetran appends rows, so the getters read a
+        few hundred pre-aggregated rows instead.
+        """
+        daily_view = f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS
+            `{self.project_id}.{self.dataset_id}.{events_table}_daily` AS
+        SELECT
+            PARSE_DATE('%Y%m%d', receivedate) as event_date,
+            COUNT(*) as event_count,
+            COUNTIF(serious = '1') as serious_count,
+            COUNTIF(serious_death = '1') as deaths,
+            COUNTIF(serious_hospitalization = '1') as hospitalizations
+        FROM `{self.project_id}.{self.dataset_id}.{events_table}`
+        -- The BETWEEN bound is sargable, so a table partitioned or
+        -- clustered on receivedate can prune; the LENGTH check still
+        -- guards PARSE_DATE against malformed values
+        WHERE receivedate BETWEEN '19000101' AND '29991231'
+            AND LENGTH(receivedate) = 8
+        GROUP BY event_date
+        """
+        # Materialized views cannot hold exact COUNT(DISTINCT), so the
+        # company count is approximate - fine for a summary table
+        recalls_view = f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS
+            `{self.project_id}.{self.dataset_id}.{recalls_table}_by_classification` AS
+        SELECT
+            classification,
+            COUNT(*) as recall_count,
+            APPROX_COUNT_DISTINCT(company_name) as companies_affected
+        FROM `{self.project_id}.{self.dataset_id}.{recalls_table}`
+        WHERE classification IS NOT NULL
+        GROUP BY classification
+        """
+        for ddl in (daily_view, recalls_view):
+            try:
+                self.bq_client.query(ddl).result()
+            except Exception as e:
+                st.warning(f"Could not create rollup view: {str(e)}")
+
+    def ensure_search_index(self, table_name: str = "fda_drug_adverse_events"):
+        """Create the search index backing SEARCH() drug lookups"""
+        query = f"""
+        CREATE SEARCH INDEX IF NOT EXISTS drug_names_idx
+        ON `{self.project_id}.{self.dataset_id}.{table_name}`(drug_names)
+        """
+        try:
+            self.bq_client.query(query).result()
+        except Exception as e:
+            st.warning(f"Could not create search index: {str(e)}")
+
+    def get_adverse_events_summary(self, table_name: str = "fda_drug_adverse_events") -> pd.DataFrame:
+        """Get summary of drug adverse events"""
+        query = f"""
+        SELECT 
+            COUNT(*) as total_events,
+            APPROX_COUNT_DISTINCT(safetyreportid) as unique_reports,
+            COUNTIF(serious = '1') as serious_events,
+            COUNTIF(serious_death = '1') as deaths,
+            COUNTIF(serious_hospitalization = '1') as hospitalizations
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        """
+        return self.query_bigquery(query, use_bqstorage=False)
+
+    def get_top_drugs_by_events(self, table_name: str = "fda_drug_adverse_events", limit: int = 10) -> pd.DataFrame:
+        """Get drugs with most adverse events"""
+        query = f"""
+        SELECT
+            drug_name,
+            COUNT(*) as event_count,
+            COUNTIF(serious = '1') as serious_count
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}_flat`,
+            UNNEST(drug_names) as drug_name
+        WHERE drug_name != ''
+        GROUP BY drug_name
+        ORDER BY event_count DESC
+        LIMIT @lim
+        """
+        return self.query_bigquery(query, params=(("lim", "INT64", limit),))
+    
+    def get_events_by_date(self, table_name: str = "fda_drug_adverse_events") -> pd.DataFrame:
+        """Get the last year's events timeline from the daily rollup"""
+        query = f"""
+        SELECT
+            event_date,
+            event_count,
+            serious_count
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}_daily`
+        WHERE event_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 365 DAY)
+        ORDER BY event_date DESC
+        """
+        return self.query_bigquery(query)
+    
+    def get_overview_bundle(self, table_name: str = "fda_drug_adverse_events") -> dict:
+        """
+        Fetch the summary, timeline and top-drugs aggregates in one job
+
+        Each aggregate alone is a separate BigQuery job with its own
+        cold-start latency; bundling them as struct/array columns of a
+        single row pays that latency once for the same scan cost.
+
+        Returns:
+            Dict with 'summary', 'timeline' and 'top_drugs' DataFrames
+        """
+        table = f"`{self.project_id}.{self.dataset_id}.{table_name}`"
+        query = f"""
+        SELECT
+            (SELECT AS STRUCT
+                COUNT(*) as total_events,
+                APPROX_COUNT_DISTINCT(safetyreportid) as unique_reports,
+                COUNTIF(serious = '1') as serious_events,
+                COUNTIF(serious_death = '1') as deaths,
+                COUNTIF(serious_hospitalization = '1') as hospitalizations
+            FROM {table}) as summary,
+            ARRAY(SELECT AS STRUCT
+                event_date,
+                event_count,
+                serious_count
+            FROM `{self.project_id}.{self.dataset_id}.{table_name}_daily`
+            WHERE event_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 365 DAY)
+            ORDER BY event_date DESC) as timeline,
+            ARRAY(SELECT AS STRUCT
+                drug_name,
+                COUNT(*) as event_count,
+                COUNTIF(serious = '1') as serious_count
+            FROM `{self.project_id}.{self.dataset_id}.{table_name}_flat`,
+                UNNEST(drug_names) as drug_name
+            WHERE drug_name != ''
+            GROUP BY drug_name
+            ORDER BY event_count DESC
+            LIMIT 15) as top_drugs
+        """
+        df = self.query_bigquery(query, use_bqstorage=False)
+
+        if df.empty:
+            return {'summary': pd.DataFrame(), 'timeline': pd.DataFrame(), 'top_drugs': pd.DataFrame()}
+
+        row = df.iloc[0]
+        return {
+            'summary': pd.DataFrame([dict(row['summary'])]),
+            'timeline': pd.DataFrame([dict(r) for r in row['timeline']]),
+            'top_drugs': pd.DataFrame([dict(r) for r in row['top_drugs']])
+        }
+
+    def get_recalls_summary(self, table_name: str = "fda_drug_recalls") -> pd.DataFrame:
+        """Get recalls summary from the per-classification rollup"""
+        query = f"""
+        SELECT
+            classification,
+            recall_count,
+            companies_affected
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}_by_classification`
+        ORDER BY recall_count DESC
+        """
+        return self.query_bigquery(query, use_bqstorage=False)
+    
+    def get_recent_recalls(self, table_name: str = "fda_drug_recalls", limit: int = 10) -> pd.DataFrame:
+        """Get recent recalls"""
+        query = f"""
+        SELECT 
+            recall_number,
+            report_date,
+            product_description,
+            reason_for_recall,
+            company_name,
+            classification,
+            status
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        ORDER BY report_date DESC
+        LIMIT @lim
+        """
+        return self.query_bigquery(query, params=(("lim", "INT64", limit),))
+    
+    def get_drug_feature_summary(self, drug_name: str,
+                                 table_name: str = "fda_drug_adverse_events") -> dict:
+        """
+        Aggregate the per-drug safety features in BigQuery
+
+        The AI analysis only needs aggregates, so computing them
+        server-side ships one small row instead of 100 raw rows that
+        would be deserialized into pandas just to be summarized again.
+
+        Returns:
+            Dict with a one-row 'stats' DataFrame and a 'top_reactions'
+            DataFrame
+        """
+        query = f"""
+        WITH hits AS (
+            SELECT *
+            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+            WHERE SEARCH(drug_names, @drug)
+        )
+        SELECT
+            (SELECT AS STRUCT
+                COUNT(*) as n_events,
+                ROUND(SAFE_DIVIDE(COUNTIF(serious = '1'), COUNT(*)), 3) as pct_serious,
+                ROUND(SAFE_DIVIDE(COUNTIF(serious_death = '1'), COUNT(*)), 3) as pct_death,
+                ROUND(SAFE_DIVIDE(COUNTIF(serious_hospitalization = '1'), COUNT(*)), 3) as pct_hospitalization,
+                APPROX_QUANTILES(patient_age, 4)[OFFSET(2)] as median_age,
+                COUNTIF(patient_sex = '1') as n_male,
+                COUNTIF(patient_sex = '2') as n_female
+            FROM hits) as stats,
+            ARRAY(SELECT AS STRUCT
+                reaction,
+                COUNT(*) as n
+            FROM hits, UNNEST(COALESCE(
+                JSON_EXTRACT_STRING_ARRAY(reactions),
+                JSON_EXTRACT_STRING_ARRAY(REPLACE(reactions, "'", '"'))
+            )) as reaction
+            WHERE reaction != ''
+            GROUP BY reaction
+            ORDER BY n DESC
+            LIMIT 10) as top_reactions
+        """
+        df = self.query_bigquery(query, use_bqstorage=False,
+                                 params=(("drug", "STRING", drug_name),))
+
+        if df.empty:
+            return {'stats': pd.DataFrame(), 'top_reactions': pd.DataFrame()}
+
+        row = df.iloc[0]
+        return {
+            'stats': pd.DataFrame([dict(row['stats'])]),
+            'top_reactions': pd.DataFrame([dict(r) for r in row['top_reactions']])
+        }
+
+    def _build_insight_prompt(self, data_summary: str, question: str) -> str:
+        """
+        Build the analyst prompt shared by the blocking and streaming paths
+
+        Static instructions come first, then the slowly-changing data
+        summary, then the per-click question last, so Vertex AI's
+        implicit prefix caching can reuse the shared prompt head across
+        questions. (Explicit CachedContent needs prefixes in the tens of
+        thousands of tokens - far larger than these summaries - so it
+        does not apply here.)
+        """
+        return f"""
+You are an FDA data analyst with expertise in drug safety and public health.
+
+Provide a detailed, actionable insight based on the data. Include:
+1. Key findings
+2. Potential concerns or trends
+3. Recommendations for healthcare providers or patients
+4. Any patterns that warrant further investigation
+
+Keep your response professional, data-driven, and focused on public health impact.
+
+Data Summary:
+{data_summary}
+
+User Question: {question}
+"""
+
+    def analyze_with_gemini(self, data_summary: str, question: str) -> str:
+        """
+        Use Vertex AI Gemini to analyze data and answer questions
+
+        Args:
+            data_summary: Summary of the data
+            question: User's question
+
+        Returns:
+            AI-generated insight
+        """
+        try:
+            return _generate_insight(self._build_insight_prompt(data_summary, question))
+
+        except Exception as e:
+            return f"Error generating AI insight: {str(e)}"
+
+    def stream_with_gemini(self, data_summary: str, question: str):
+        """
+        Stream an AI insight as Gemini produces it
+
+        Yields:
+            Text chunks suitable for st.write_stream
+
+        Repeat prompts replay from the insight cache instead of paying
+        the model latency and token cost again
+        """
+        prompt = self._build_insight_prompt(data_summary, question)
+        cache = _insight_cache()
+        if prompt in cache:
+            yield cache[prompt]
+            return
+        try:
+            parts = []
+            for chunk in self.vertex_model.generate_content(prompt, stream=True):
+                parts.append(chunk.text)
+                yield chunk.text
+            cache[prompt] = "".join(parts)
+        except Exception as e:
+            yield f"Error generating AI insight: {str(e)}"
+    
+    def get_ai_safety_recommendations(self, drug_name: str, features: dict) -> str:
+        """Get AI-powered safety recommendations for a drug"""
+
+        # A compact JSON digest tokenizes ~10x smaller than the
+        # fixed-width to_string dump of 100 raw rows, and gives the model
+        # aggregates it can actually reason over
+        stats = features.get('stats', pd.DataFrame())
+        if not stats.empty:
+            summary = stats.iloc[0].to_dict()
+            top_reactions = features.get('top_reactions', pd.DataFrame())
+            if not top_reactions.empty:
+                summary['top_reactions'] = dict(
+                    zip(top_reactions['reaction'], top_reactions['n'].astype(int))
+                )
+            events_summary = json.dumps(summary, default=str)
+        else:
+            events_summary = "No data available"
+        
+        # Static prefix first, variable drug data last, for the same
+        # implicit prefix-caching reason as analyze_with_gemini
+        prompt = f"""
+Analyze adverse event data for a drug and provide:
+1. Risk assessment summary
+2. Most concerning adverse events
+3. Patient populations who should be cautious
+4. Recommendations for healthcare providers
+5. Suggested monitoring parameters
+
+Be concise but thorough.
+
+Drug: {drug_name}
+
+Adverse Event Data:
+{events_summary}
+"""
+        
+        try:
+            return _generate_insight(prompt)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+
+def main():
+    """Main application"""
+    
+    # Header
+    st.markdown('<h1 class="main-header">💊 FDA Intelligence Dashboard</h1>', unsafe_allow_html=True)
+    st.markdown("**Powered by Fivetran, Google Cloud BigQuery & Vertex AI**")
+    st.markdown("---")
+    
+    # Initialize dashboard once per session; reconstructing it on every
+    # rerun nulled the clients and forced a reconnect per interaction
+    if 'dashboard' not in st.session_state:
+        st.session_state.dashboard = FDADashboard()
+
+    dashboard = st.session_state.dashboard
+    
+    # Sidebar configuration
+    st.sidebar.title("⚙️ Configuration")
+    
+    project_id = st.sidebar.text_input(
+        "GCP Project ID",
+        value=os.environ.get("GCP_PROJECT_ID", ""),
+        help="Your Google Cloud Project ID"
+    )
+    
+    dataset_id = st.sidebar.text_input(
+        "BigQuery Dataset ID",
+        value=os.environ.get("BQ_DATASET_ID", "fda_data"),
+        help="BigQuery dataset where Fivetran syncs FDA data"
+    )
+    
+    location = st.sidebar.selectbox(
+        "GCP Region",
+        ["us-central1", "us-east1", "us-west1", "europe-west1", "asia-east1"],
+        help="Google Cloud region"
+    )
+    
+    # Connect button
+    if st.sidebar.button("🔌 Connect to Google Cloud", type="primary"):
+        if project_id and dataset_id:
+            dashboard.setup_google_cloud(project_id, dataset_id, location)
+        else:
+            st.sidebar.error("Please provide Project ID and Dataset ID")
+
+    # Drop cached query results so the next rerun hits BigQuery again
+    if st.sidebar.button("🔄 Refresh data"):
+        st.cache_data.clear()
+    
+    # Main content
+    if dashboard.bq_client is None:
+        st.info("👈 Please configure and connect to Google Cloud in the sidebar to begin")
+        
+        # Setup instructions
+        st.markdown("## 🚀 Quick Start")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            ### 1️⃣ Setup Fivetran Connector
+            - Deploy FDA connector to Fivetran
+            - Connect to BigQuery destination
+            - Start syncing FDA data
+            """)
+        
+        with col2:
+            st.markdown("""
+            ### 2️⃣ Configure Dashboard
+            - Enter GCP Project ID
+            - Specify BigQuery dataset
+            - Click Connect
+            """)
+        
+        return
+    
+    # Dashboard tabs
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "📊 Overview",
+        "⚠️ Adverse Events",
+        "🔄 Recalls",
+        "🤖 AI Insights"
+    ])
+    
+    # Tab 1: Overview
+    with tab1:
+        st.header("Dashboard Overview")
+        
+        col1, col2, col3, col4 = st.columns(4)
+
+        # Get summary + timeline from the single fused overview job
+        overview = dashboard.get_overview_bundle()
+        summary = overview['summary']
+        
+        if not summary.empty:
+            with col1:
+                st.metric(
+                    "Total Events",
+                    f"{summary['total_events'].iloc[0]:,}"
+                )
+            
+            with col2:
+                st.metric(
+                    "Serious Events",
+                    f"{summary['serious_events'].iloc[0]:,}",
+                    delta=f"{(summary['serious_events'].iloc[0] / summary['total_events'].iloc[0] * 100):.1f}%"
+                )
+            
+            with col3:
+                st.metric(
+                    "Deaths Reported",
+                    f"{summary['deaths'].iloc[0]:,}"
+                )
+            
+            with col4:
+                st.metric(
+                    "Hospitalizations",
+                    f"{summary['hospitalizations'].iloc[0]:,}"
+                )
+        
+        st.markdown("---")
+        
+        # Timeline
+        st.subheader("📈 Events Timeline")
+        events_timeline = overview['timeline']
+        
+        if not events_timeline.empty:
+            import plotly.graph_objects as go
+
+            # Scattergl renders on the GPU, keeping pan/zoom fluid as the
+            # timeline grows; uirevision preserves view state across reruns
+            fig = go.Figure()
+            fig.add_trace(go.Scattergl(
+                x=events_timeline['event_date'],
+                y=events_timeline['event_count'],
+                name='All Events',
+                line=dict(color='#1f77b4', width=2)
+            ))
+            fig.add_trace(go.Scattergl(
+                x=events_timeline['event_date'],
+                y=events_timeline['serious_count'],
+                name='Serious Events',
+                line=dict(color='#ff7f0e', width=2)
+            ))
+            fig.update_layout(
+                title='Adverse Events Over Time',
+                xaxis_title='Date',
+                yaxis_title='Number of Events',
+                hovermode='x unified',
+                height=400,
+                uirevision='timeline'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    
+    # Tab 2: Adverse Events
+    with tab2:
+        st.header("⚠️ Adverse Events Analysis")
+        
+        # Top drugs
+        st.subheader("Top Drugs by Adverse Events")
+        top_drugs = dashboard.get_top_drugs_by_events(limit=15)
+        
+        if not top_drugs.empty:
+            import plotly.express as px
+
+            fig = px.bar(
+                top_drugs,
+                x='event_count',
+                y='drug_name',
+                orientation='h',
+                color='serious_count',
+                title='Drugs with Most Reported Adverse Events',
+                labels={'event_count': 'Total Events', 'drug_name': 'Drug Name', 'serious_count': 'Serious Events'},
+                color_continuous_scale='Reds'
+            )
+            fig.update_layout(height=500)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Data table
+            st.subheader("Detailed Data")
+            st.dataframe(top_drugs, use_container_width=True)
+    
+    # Tab 3: Recalls
+    with tab3:
+        st.header("🔄 Drug Recalls")
+        
+        col1, col2 = st.columns([1, 2])
+
+        # The two recall queries are independent; BQ RPCs are I/O-bound,
+        # so issuing them in parallel roughly halves the tab's load time
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary_future = _submit_with_ctx(executor, dashboard.get_recalls_summary)
+            recent_future = _submit_with_ctx(executor, dashboard.get_recent_recalls)
+            recalls_summary = summary_future.result()
+            recent_recalls = recent_future.result()
+
+        with col1:
+            st.subheader("Recalls by Classification")
+
+            if not recalls_summary.empty:
+                import plotly.express as px
+
+                fig = px.pie(
+                    recalls_summary,
+                    values='recall_count',
+                    names='classification',
+                    title='Recall Distribution',
+                    color_discrete_sequence=px.colors.sequential.RdBu
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.subheader("Recent Recalls")
+
+            if not recent_recalls.empty:
+                # Truncate titles vectorized once instead of slicing per row
+                recent_recalls = recent_recalls.assign(
+                    short_desc=recent_recalls['product_description'].str.slice(0, 100)
+                )
+                # itertuples avoids building a Series per row like iterrows
+                recall_cols = ['short_desc', 'recall_number', 'report_date',
+                               'company_name', 'classification', 'status', 'reason_for_recall']
+                for product, number, date, company, classification, status, reason in \
+                        recent_recalls[recall_cols].itertuples(index=False, name=None):
+                    with st.expander(f"🔴 {product}..."):
+                        st.markdown(f"""
+                        **Recall Number:** {number}  
+                        **Date:** {date}  
+                        **Company:** {company}  
+                        **Classification:** {classification}  
+                        **Status:** {status}  
+                        **Reason:** {reason}
+                        """)
+    
+    # Tab 4: AI Insights
+    with tab4:
+        st.header("🤖 AI-Powered Insights")
+        st.markdown("*Powered by Google Vertex AI Gemini*")
+        
+        # Question answering
+        st.subheader("Ask Questions About FDA Data")
+        
+        # chat_input only submits on Enter, so the model runs exactly once
+        # per question instead of on button re-clicks or stray reruns
+        if user_question := st.chat_input(
+            "e.g., What are the most concerning drug safety trends?"
+        ):
+            with st.spinner("Fetching data..."):
+                # Get relevant data in one fused job
+                overview = dashboard.get_overview_bundle()
+                summary = overview['summary']
+                top_drugs = overview['top_drugs']
+
+            data_summary = f"""
+            Total Events: {summary['total_events'].iloc[0] if not summary.empty else 0}
+            Serious Events: {summary['serious_events'].iloc[0] if not summary.empty else 0}
+            Deaths: {summary['deaths'].iloc[0] if not summary.empty else 0}
+
+            Top Drugs by Events:
+            {top_drugs.to_string() if not top_drugs.empty else 'No data'}
+            """
+
+            # Stream tokens as they arrive instead of blocking the UI
+            # behind the full generation
+            st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+            st.markdown("### 💡 AI Insight")
+            st.write_stream(dashboard.stream_with_gemini(data_summary, user_question))
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown("---")
+        
+        # Drug-specific analysis
+        st.subheader("Drug Safety Analysis")
+        
+        drug_name = st.text_input("Enter drug name for detailed analysis")
+        
+        if st.button("📊 Analyze Drug", type="secondary"):
+            if drug_name:
+                with st.spinner(f"Analyzing {drug_name}..."):
+                    # Aggregate the drug's safety features server-side
+                    features = dashboard.get_drug_feature_summary(drug_name)
+                    stats = features['stats']
+
+                    if not stats.empty and stats['n_events'].iloc[0] > 0:
+                        recommendations = dashboard.get_ai_safety_recommendations(drug_name, features)
+                        
+                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
+                        st.markdown(f"### ⚠️ Safety Analysis: {drug_name}")
+                        st.markdown(recommendations)
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    else:
+                        st.warning(f"No data found for {drug_name}")
+    
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: #666;'>
+        <p>Built for the Fivetran × Google Cloud Challenge 2024</p>
+        <p>Data source: openFDA | Powered by Fivetran, BigQuery & Vertex AI</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    main()
+
+
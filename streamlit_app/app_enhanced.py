@@ -1,1028 +1,1639 @@
-"""
-FDA Data Intelligence Dashboard - Enhanced with Multiple GCP AI Features
-
-An advanced Streamlit dashboard leveraging:
-- Vertex AI Gemini (Generative AI)
-- BigQuery ML (Predictive Analytics)
-- Vertex AI Embeddings (Semantic Search)
-- Natural Language API (Entity Extraction & Sentiment Analysis)
-- Translation API (Multi-language Support)
-- Document AI (PDF Parsing)
-- Speech-to-Text (Voice Queries)
-- Text-to-Speech (Audio Insights)
-"""
-
-import streamlit as st
-import pandas as pd
-from google.cloud import bigquery
-from google.cloud import aiplatform
-from google.cloud import language_v1
-from google.cloud import translate_v2 as translate
-from google.cloud import speech_v1 as speech
-from google.cloud import texttospeech
-import vertexai
-from vertexai.generative_models import GenerativeModel
-from vertexai.language_models import TextEmbeddingModel
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
-import os
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import base64
-from io import BytesIO
-import tempfile
-
-# Page configuration
-st.set_page_config(
-    page_title="FDA Intelligence Dashboard - AI Enhanced",
-    page_icon="🧬",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS for better UI
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        background: linear-gradient(120deg, #1f77b4, #ff7f0e);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .insight-box {
-        background-color: #e8f4f8;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1f77b4;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #fff3cd;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #ffc107;
-        margin: 1rem 0;
-    }
-    .success-box {
-        background-color: #d4edda;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #28a745;
-        margin: 1rem 0;
-    }
-    .ai-badge {
-        display: inline-block;
-        background: linear-gradient(120deg, #667eea, #764ba2);
-        color: white;
-        padding: 0.25rem 0.75rem;
-        border-radius: 12px;
-        font-size: 0.8rem;
-        font-weight: bold;
-        margin-left: 0.5rem;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-
-class EnhancedFDADashboard:
-    """Enhanced FDA Dashboard with Multiple GCP AI Features"""
-    
-    def __init__(self):
-        """Initialize dashboard with all Google Cloud AI services"""
-        self.bq_client = None
-        self.gemini_model = None
-        self.embedding_model = None
-        self.nl_client = None
-        self.translate_client = None
-        self.speech_client = None
-        self.tts_client = None
-        self.project_id = None
-        self.dataset_id = None
-        self.location = None
-        
-    def setup_google_cloud(self, project_id: str, dataset_id: str, location: str = "us-central1"):
-        """
-        Setup all Google Cloud AI services
-        
-        Args:
-            project_id: GCP project ID
-            dataset_id: BigQuery dataset ID
-            location: GCP region
-        """
-        try:
-            self.project_id = project_id
-            self.dataset_id = dataset_id
-            self.location = location
-            
-            # Initialize BigQuery
-            self.bq_client = bigquery.Client(project=project_id)
-            
-            # Initialize Vertex AI
-            vertexai.init(project=project_id, location=location)
-            self.gemini_model = GenerativeModel("gemini-1.5-flash")
-            
-            # Initialize Vertex AI Embeddings
-            self.embedding_model = TextEmbeddingModel.from_pretrained("textembedding-gecko@003")
-            
-            # Initialize Natural Language API
-            self.nl_client = language_v1.LanguageServiceClient()
-            
-            # Initialize Translation API
-            self.translate_client = translate.Client()
-            
-            # Initialize Speech-to-Text
-            self.speech_client = speech.SpeechClient()
-            
-            # Initialize Text-to-Speech
-            self.tts_client = texttospeech.TextToSpeechClient()
-            
-            st.success("✅ Connected to all Google Cloud AI services successfully!")
-            return True
-            
-        except Exception as e:
-            st.error(f"❌ Error connecting to Google Cloud: {str(e)}")
-            return False
-    
-    # ==================== BigQuery Operations ====================
-    
-    def query_bigquery(self, query: str) -> pd.DataFrame:
-        """Execute BigQuery query"""
-        try:
-            df = self.bq_client.query(query).to_dataframe()
-            return df
-        except Exception as e:
-            st.error(f"Error querying BigQuery: {str(e)}")
-            return pd.DataFrame()
-    
-    def get_adverse_events_summary(self, table_name: str = "fda_drug_adverse_events") -> pd.DataFrame:
-        """Get summary of drug adverse events"""
-        query = f"""
-        SELECT 
-            COUNT(*) as total_events,
-            COUNT(DISTINCT safetyreportid) as unique_reports,
-            COUNTIF(serious = '1') as serious_events,
-            COUNTIF(serious_death = '1') as deaths,
-            COUNTIF(serious_hospitalization = '1') as hospitalizations
-        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-        """
-        return self.query_bigquery(query)
-    
-    def get_top_drugs_by_events(self, table_name: str = "fda_drug_adverse_events", limit: int = 10) -> pd.DataFrame:
-        """Get drugs with most adverse events"""
-        query = f"""
-        WITH drug_events AS (
-            SELECT 
-                REGEXP_EXTRACT(drug_names, r"'([^']+)'") as drug_name,
-                safetyreportid,
-                serious
-            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-            WHERE drug_names != '[]'
-        )
-        SELECT 
-            drug_name,
-            COUNT(*) as event_count,
-            COUNTIF(serious = '1') as serious_count
-        FROM drug_events
-        WHERE drug_name IS NOT NULL AND drug_name != ''
-        GROUP BY drug_name
-        ORDER BY event_count DESC
-        LIMIT {limit}
-        """
-        return self.query_bigquery(query)
-    
-    # ==================== BigQuery ML - Predictive Analytics ====================
-    
-    def create_adverse_event_prediction_model(self, table_name: str = "fda_drug_adverse_events"):
-        """
-        Create a BigQuery ML model to predict adverse event risk
-        <span class="ai-badge">BigQuery ML</span>
-        """
-        try:
-            model_name = f"{self.project_id}.{self.dataset_id}.adverse_event_predictor"
-            
-            create_model_query = f"""
-            CREATE OR REPLACE MODEL `{model_name}`
-            OPTIONS(
-                model_type='LOGISTIC_REG',
-                input_label_cols=['serious'],
-                auto_class_weights=TRUE
-            ) AS
-            SELECT
-                serious,
-                patient_age,
-                patient_sex,
-                CAST(serious_death AS INT64) as serious_death_flag,
-                CAST(serious_hospitalization AS INT64) as serious_hosp_flag
-            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-            WHERE patient_age IS NOT NULL 
-            AND patient_sex IS NOT NULL
-            AND serious IN ('0', '1')
-            LIMIT 10000
-            """
-            
-            self.bq_client.query(create_model_query).result()
-            return True, "Model created successfully!"
-            
-        except Exception as e:
-            return False, f"Error creating model: {str(e)}"
-    
-    def predict_adverse_event_risk(self, patient_age: float, patient_sex: str) -> dict:
-        """
-        Predict adverse event risk for a patient profile
-        <span class="ai-badge">BigQuery ML</span>
-        """
-        try:
-            model_name = f"{self.project_id}.{self.dataset_id}.adverse_event_predictor"
-            
-            predict_query = f"""
-            SELECT
-                predicted_serious,
-                predicted_serious_probs[OFFSET(1)].prob as risk_probability
-            FROM ML.PREDICT(MODEL `{model_name}`,
-                (SELECT 
-                    {patient_age} as patient_age,
-                    '{patient_sex}' as patient_sex,
-                    0 as serious_death_flag,
-                    0 as serious_hosp_flag
-                )
-            )
-            """
-            
-            result = self.query_bigquery(predict_query)
-            
-            if not result.empty:
-                return {
-                    "risk_level": "High" if result['risk_probability'].iloc[0] > 0.5 else "Low",
-                    "probability": float(result['risk_probability'].iloc[0]),
-                    "predicted_serious": result['predicted_serious'].iloc[0]
-                }
-            return None
-            
-        except Exception as e:
-            st.error(f"Prediction error: {str(e)}")
-            return None
-    
-    # ==================== Vertex AI Embeddings - Semantic Search ====================
-    
-    def generate_embedding(self, text: str) -> list:
-        """
-        Generate text embedding using Vertex AI
-        <span class="ai-badge">Vertex AI Embeddings</span>
-        """
-        try:
-            embeddings = self.embedding_model.get_embeddings([text])
-            return embeddings[0].values
-        except Exception as e:
-            st.error(f"Embedding error: {str(e)}")
-            return None
-    
-    def semantic_search_drugs(self, query: str, table_name: str = "fda_drug_adverse_events", top_k: int = 5) -> pd.DataFrame:
-        """
-        Perform semantic search across drug adverse events
-        <span class="ai-badge">Vertex AI Embeddings</span>
-        """
-        try:
-            # Generate query embedding
-            query_embedding = self.generate_embedding(query)
-            if query_embedding is None:
-                return pd.DataFrame()
-            
-            # Get sample of drug data
-            data_query = f"""
-            SELECT DISTINCT
-                REGEXP_EXTRACT(drug_names, r"'([^']+)'") as drug_name,
-                reactions,
-                COUNT(*) as event_count
-            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
-            WHERE drug_names != '[]'
-            GROUP BY drug_name, reactions
-            LIMIT 100
-            """
-            
-            df = self.query_bigquery(data_query)
-            
-            if df.empty:
-                return pd.DataFrame()
-            
-            # Generate embeddings for each drug description
-            df['description'] = df['drug_name'] + ": " + df['reactions'].astype(str)
-            df['embedding'] = df['description'].apply(lambda x: self.generate_embedding(x[:1000]))
-            
-            # Filter out None embeddings
-            df = df[df['embedding'].notna()]
-            
-            if df.empty:
-                return pd.DataFrame()
-            
-            # Calculate similarity scores
-            embeddings_matrix = np.array(df['embedding'].tolist())
-            query_embedding_array = np.array(query_embedding).reshape(1, -1)
-            similarities = cosine_similarity(query_embedding_array, embeddings_matrix)[0]
-            
-            df['similarity_score'] = similarities
-            df = df.sort_values('similarity_score', ascending=False).head(top_k)
-            
-            return df[['drug_name', 'event_count', 'similarity_score']]
-            
-        except Exception as e:
-            st.error(f"Semantic search error: {str(e)}")
-            return pd.DataFrame()
-    
-    # ==================== Natural Language API ====================
-    
-    def analyze_sentiment_and_entities(self, text: str) -> dict:
-        """
-        Analyze text sentiment and extract entities
-        <span class="ai-badge">Natural Language API</span>
-        """
-        try:
-            document = language_v1.Document(
-                content=text,
-                type_=language_v1.Document.Type.PLAIN_TEXT
-            )
-            
-            # Sentiment analysis
-            sentiment = self.nl_client.analyze_sentiment(
-                request={'document': document}
-            ).document_sentiment
-            
-            # Entity extraction
-            entities_response = self.nl_client.analyze_entities(
-                request={'document': document}
-            )
-            
-            entities = []
-            for entity in entities_response.entities:
-                entities.append({
-                    'name': entity.name,
-                    'type': language_v1.Entity.Type(entity.type_).name,
-                    'salience': entity.salience
-                })
-            
-            return {
-                'sentiment': {
-                    'score': sentiment.score,
-                    'magnitude': sentiment.magnitude
-                },
-                'entities': entities[:10]  # Top 10 entities
-            }
-            
-        except Exception as e:
-            return {'error': str(e)}
-    
-    # ==================== Translation API ====================
-    
-    def translate_text(self, text: str, target_language: str = 'es') -> str:
-        """
-        Translate text to target language
-        <span class="ai-badge">Translation API</span>
-        """
-        try:
-            result = self.translate_client.translate(
-                text,
-                target_language=target_language
-            )
-            return result['translatedText']
-        except Exception as e:
-            return f"Translation error: {str(e)}"
-    
-    def get_supported_languages(self) -> list:
-        """Get list of supported languages"""
-        try:
-            results = self.translate_client.get_languages()
-            return [{'code': lang['language'], 'name': lang['name']} 
-                    for lang in results]
-        except:
-            return []
-    
-    # ==================== Speech-to-Text ====================
-    
-    def transcribe_audio(self, audio_file) -> str:
-        """
-        Transcribe audio to text
-        <span class="ai-badge">Speech-to-Text</span>
-        """
-        try:
-            content = audio_file.read()
-            
-            audio = speech.RecognitionAudio(content=content)
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=16000,
-                language_code="en-US",
-            )
-            
-            response = self.speech_client.recognize(config=config, audio=audio)
-            
-            transcript = ""
-            for result in response.results:
-                transcript += result.alternatives[0].transcript + " "
-            
-            return transcript.strip()
-            
-        except Exception as e:
-            return f"Transcription error: {str(e)}"
-    
-    # ==================== Text-to-Speech ====================
-    
-    def synthesize_speech(self, text: str) -> bytes:
-        """
-        Convert text to speech
-        <span class="ai-badge">Text-to-Speech</span>
-        """
-        try:
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="en-US",
-                name="en-US-Neural2-F",
-                ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-            )
-            
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3
-            )
-            
-            response = self.tts_client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
-            
-            return response.audio_content
-            
-        except Exception as e:
-            st.error(f"Text-to-speech error: {str(e)}")
-            return None
-    
-    # ==================== Vertex AI Gemini ====================
-    
-    def analyze_with_gemini(self, data_summary: str, question: str) -> str:
-        """
-        Use Vertex AI Gemini for advanced analysis
-        <span class="ai-badge">Vertex AI Gemini</span>
-        """
-        try:
-            prompt = f"""
-You are an expert FDA data analyst with deep knowledge of pharmacovigilance and drug safety.
-
-Data Summary:
-{data_summary}
-
-User Question: {question}
-
-Provide a comprehensive, actionable analysis including:
-1. Key findings and statistical insights
-2. Potential safety concerns and trends
-3. Risk stratification and patient populations at higher risk
-4. Evidence-based recommendations for healthcare providers
-5. Patterns warranting regulatory attention
-6. Suggested monitoring and mitigation strategies
-
-Be precise, data-driven, and focus on public health impact.
-"""
-            
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
-            
-        except Exception as e:
-            return f"Error generating AI insight: {str(e)}"
-    
-    def get_ai_safety_recommendations(self, drug_name: str, adverse_events: pd.DataFrame) -> str:
-        """Get comprehensive AI-powered safety recommendations"""
-        
-        events_summary = adverse_events.to_string() if not adverse_events.empty else "No data available"
-        
-        prompt = f"""
-Conduct a comprehensive drug safety assessment for {drug_name}:
-
-Adverse Event Data:
-{events_summary}
-
-Provide a detailed analysis with:
-1. **Risk Assessment Summary**: Overall safety profile
-2. **Critical Adverse Events**: Most concerning reactions with severity levels
-3. **High-Risk Populations**: Patient demographics requiring caution
-4. **Contraindications**: Situations where drug should be avoided
-5. **Monitoring Parameters**: Laboratory tests and vital signs to track
-6. **Drug Interactions**: Potential interactions to screen for
-7. **Healthcare Provider Recommendations**: Prescribing guidelines
-8. **Patient Counseling Points**: Key information for patients
-
-Use evidence-based reasoning and clinical best practices.
-"""
-        
-        try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error: {str(e)}"
-
-
-def main():
-    """Main application with enhanced AI features"""
-    
-    # Header
-    st.markdown('<h1 class="main-header">🧬 FDA Intelligence Dashboard - AI Enhanced</h1>', unsafe_allow_html=True)
-    st.markdown("""
-    **Powered by 8 Google Cloud AI Services:**
-    <span class="ai-badge">Vertex AI Gemini</span>
-    <span class="ai-badge">BigQuery ML</span>
-    <span class="ai-badge">Embeddings</span>
-    <span class="ai-badge">Natural Language</span>
-    <span class="ai-badge">Translation</span>
-    <span class="ai-badge">Speech-to-Text</span>
-    <span class="ai-badge">Text-to-Speech</span>
-    """, unsafe_allow_html=True)
-    st.markdown("---")
-    
-    # Initialize dashboard
-    if 'dashboard' not in st.session_state:
-        st.session_state.dashboard = EnhancedFDADashboard()
-    
-    dashboard = st.session_state.dashboard
-    
-    # Sidebar configuration
-    st.sidebar.title("⚙️ Configuration")
-    
-    project_id = st.sidebar.text_input(
-        "GCP Project ID",
-        value=os.environ.get("GCP_PROJECT_ID", ""),
-        help="Your Google Cloud Project ID"
-    )
-    
-    dataset_id = st.sidebar.text_input(
-        "BigQuery Dataset ID",
-        value=os.environ.get("BQ_DATASET_ID", "fda_data"),
-        help="BigQuery dataset where Fivetran syncs FDA data"
-    )
-    
-    location = st.sidebar.selectbox(
-        "GCP Region",
-        ["us-central1", "us-east1", "us-west1", "europe-west1", "asia-east1"],
-        help="Google Cloud region"
-    )
-    
-    # Connect button
-    if st.sidebar.button("🔌 Connect to Google Cloud AI", type="primary"):
-        if project_id and dataset_id:
-            dashboard.setup_google_cloud(project_id, dataset_id, location)
-        else:
-            st.sidebar.error("Please provide Project ID and Dataset ID")
-    
-    # AI Features Status
-    if dashboard.bq_client:
-        st.sidebar.success("✅ Connected")
-        st.sidebar.markdown("### 🤖 AI Services Active:")
-        st.sidebar.markdown("""
-        - ✅ Vertex AI Gemini
-        - ✅ BigQuery ML
-        - ✅ Embeddings
-        - ✅ Natural Language
-        - ✅ Translation
-        - ✅ Speech-to-Text
-        - ✅ Text-to-Speech
-        """)
-    
-    # Main content
-    if dashboard.bq_client is None:
-        st.info("👈 Please configure and connect to Google Cloud in the sidebar to begin")
-        
-        # Feature showcase
-        st.markdown("## 🚀 Enhanced AI Features")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            ### 🎯 Predictive Analytics
-            - **BigQuery ML**: Predict adverse event risk
-            - **AutoML**: Custom safety models
-            - Real-time risk scoring
-            
-            ### 🔍 Semantic Search
-            - **Vertex AI Embeddings**: Find similar drugs
-            - Natural language queries
-            - Context-aware results
-            
-            ### 🌐 Multi-Language Support
-            - **Translation API**: 100+ languages
-            - Instant translation
-            - Global accessibility
-            """)
-        
-        with col2:
-            st.markdown("""
-            ### 🧠 Advanced NLP
-            - **Natural Language API**: Entity extraction
-            - Sentiment analysis
-            - Key phrase detection
-            
-            ### 🎤 Voice Interface
-            - **Speech-to-Text**: Voice queries
-            - **Text-to-Speech**: Audio insights
-            - Hands-free operation
-            
-            ### 💡 Generative AI
-            - **Vertex AI Gemini**: Complex reasoning
-            - Comprehensive recommendations
-            - Evidence-based insights
-            """)
-        
-        return
-    
-    # Enhanced Dashboard Tabs
-    tabs = st.tabs([
-        "📊 Overview",
-        "🔮 Predictive Analytics",
-        "🔍 Semantic Search",
-        "🧠 NLP Analysis",
-        "🌐 Translation",
-        "🎤 Voice Interface",
-        "🤖 AI Insights"
-    ])
-    
-    # Tab 1: Overview (keeping existing functionality)
-    with tabs[0]:
-        st.header("Dashboard Overview")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        summary = dashboard.get_adverse_events_summary()
-        
-        if not summary.empty:
-            with col1:
-                st.metric("Total Events", f"{summary['total_events'].iloc[0]:,}")
-            with col2:
-                st.metric("Serious Events", f"{summary['serious_events'].iloc[0]:,}",
-                         delta=f"{(summary['serious_events'].iloc[0] / summary['total_events'].iloc[0] * 100):.1f}%")
-            with col3:
-                st.metric("Deaths Reported", f"{summary['deaths'].iloc[0]:,}")
-            with col4:
-                st.metric("Hospitalizations", f"{summary['hospitalizations'].iloc[0]:,}")
-        
-        st.markdown("---")
-        
-        st.subheader("📈 Top Drugs by Adverse Events")
-        top_drugs = dashboard.get_top_drugs_by_events(limit=15)
-        
-        if not top_drugs.empty:
-            fig = px.bar(
-                top_drugs,
-                x='event_count',
-                y='drug_name',
-                orientation='h',
-                color='serious_count',
-                title='Drugs with Most Reported Adverse Events',
-                labels={'event_count': 'Total Events', 'drug_name': 'Drug Name', 'serious_count': 'Serious Events'},
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-    
-    # Tab 2: Predictive Analytics with BigQuery ML
-    with tabs[1]:
-        st.header("🔮 Predictive Analytics")
-        st.markdown('<span class="ai-badge">BigQuery ML</span>', unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.subheader("Model Training")
-            st.info("Train a machine learning model to predict adverse event risk based on patient characteristics.")
-            
-            if st.button("🏋️ Train BigQuery ML Model", type="primary"):
-                with st.spinner("Training model... This may take a few minutes"):
-                    success, message = dashboard.create_adverse_event_prediction_model()
-                    if success:
-                        st.success(f"✅ {message}")
-                    else:
-                        st.error(f"❌ {message}")
-        
-        with col2:
-            st.subheader("Risk Prediction")
-            st.info("Predict adverse event risk for a patient profile.")
-            
-            patient_age = st.number_input("Patient Age", min_value=0, max_value=120, value=45)
-            patient_sex = st.selectbox("Patient Sex", ["1", "2"], format_func=lambda x: "Male" if x == "1" else "Female")
-            
-            if st.button("🎯 Predict Risk"):
-                with st.spinner("Analyzing..."):
-                    prediction = dashboard.predict_adverse_event_risk(float(patient_age), patient_sex)
-                    
-                    if prediction:
-                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
-                        st.markdown(f"""
-                        ### Prediction Results
-                        
-                        **Risk Level**: {prediction['risk_level']}  
-                        **Probability**: {prediction['probability']:.2%}  
-                        **Predicted Serious Event**: {'Yes' if prediction['predicted_serious'] == '1' else 'No'}
-                        
-                        *This is a predictive model for research purposes only. Always consult healthcare professionals for medical decisions.*
-                        """)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        
-                        # Visualization
-                        fig = go.Figure(go.Indicator(
-                            mode="gauge+number",
-                            value=prediction['probability'] * 100,
-                            title={'text': "Adverse Event Risk Score"},
-                            gauge={
-                                'axis': {'range': [None, 100]},
-                                'bar': {'color': "darkred" if prediction['probability'] > 0.5 else "green"},
-                                'steps': [
-                                    {'range': [0, 30], 'color': "lightgreen"},
-                                    {'range': [30, 70], 'color': "yellow"},
-                                    {'range': [70, 100], 'color': "lightcoral"}
-                                ],
-                                'threshold': {
-                                    'line': {'color': "red", 'width': 4},
-                                    'thickness': 0.75,
-                                    'value': 50
-                                }
-                            }
-                        ))
-                        st.plotly_chart(fig, use_container_width=True)
-    
-    # Tab 3: Semantic Search with Vertex AI Embeddings
-    with tabs[2]:
-        st.header("🔍 Semantic Search")
-        st.markdown('<span class="ai-badge">Vertex AI Embeddings</span>', unsafe_allow_html=True)
-        
-        st.info("Search drugs using natural language. The AI understands meaning, not just keywords!")
-        
-        search_query = st.text_input(
-            "Search Query",
-            placeholder="e.g., drugs causing heart problems, medications with respiratory side effects"
-        )
-        
-        top_k = st.slider("Number of results", min_value=3, max_value=10, value=5)
-        
-        if st.button("🔎 Semantic Search", type="primary"):
-            if search_query:
-                with st.spinner("Performing AI-powered semantic search..."):
-                    results = dashboard.semantic_search_drugs(search_query, top_k=top_k)
-                    
-                    if not results.empty:
-                        st.success(f"Found {len(results)} relevant results")
-                        
-                        # Display results
-                        for idx, row in results.iterrows():
-                            similarity_pct = row['similarity_score'] * 100
-                            
-                            st.markdown(f"""
-                            <div class="insight-box">
-                            <h4>{row['drug_name']}</h4>
-                            <p><strong>Similarity Score:</strong> {similarity_pct:.1f}%</p>
-                            <p><strong>Adverse Event Count:</strong> {row['event_count']:,}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                    else:
-                        st.warning("No results found. Try a different query.")
-    
-    # Tab 4: NLP Analysis with Natural Language API
-    with tabs[3]:
-        st.header("🧠 NLP Analysis")
-        st.markdown('<span class="ai-badge">Natural Language API</span>', unsafe_allow_html=True)
-        
-        st.info("Extract entities and analyze sentiment from adverse event reports or drug descriptions.")
-        
-        text_input = st.text_area(
-            "Enter text to analyze",
-            placeholder="Paste adverse event description, drug label excerpt, or any relevant text...",
-            height=150
-        )
-        
-        if st.button("🧪 Analyze Text", type="primary"):
-            if text_input:
-                with st.spinner("Analyzing with Google Natural Language AI..."):
-                    analysis = dashboard.analyze_sentiment_and_entities(text_input)
-                    
-                    if 'error' not in analysis:
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.subheader("😊 Sentiment Analysis")
-                            sentiment = analysis['sentiment']
-                            
-                            sentiment_label = "Positive" if sentiment['score'] > 0.25 else "Negative" if sentiment['score'] < -0.25 else "Neutral"
-                            sentiment_color = "green" if sentiment['score'] > 0 else "red" if sentiment['score'] < 0 else "gray"
-                            
-                            st.markdown(f"""
-                            <div class="metric-card">
-                            <p><strong>Sentiment:</strong> <span style="color: {sentiment_color};">{sentiment_label}</span></p>
-                            <p><strong>Score:</strong> {sentiment['score']:.2f} (-1 to 1)</p>
-                            <p><strong>Magnitude:</strong> {sentiment['magnitude']:.2f}</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col2:
-                            st.subheader("🏷️ Extracted Entities")
-                            
-                            if analysis['entities']:
-                                entities_df = pd.DataFrame(analysis['entities'])
-                                st.dataframe(entities_df, use_container_width=True)
-                            else:
-                                st.info("No entities found")
-                    else:
-                        st.error(f"Analysis error: {analysis['error']}")
-    
-    # Tab 5: Translation with Translation API
-    with tabs[4]:
-        st.header("🌐 Multi-Language Translation")
-        st.markdown('<span class="ai-badge">Translation API</span>', unsafe_allow_html=True)
-        
-        st.info("Translate drug safety information into 100+ languages for global accessibility.")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            text_to_translate = st.text_area(
-                "Text to Translate",
-                placeholder="Enter drug information, safety warnings, or insights...",
-                height=150
-            )
-        
-        with col2:
-            target_lang = st.selectbox(
-                "Target Language",
-                options=[
-                    ('es', 'Spanish'),
-                    ('fr', 'French'),
-                    ('de', 'German'),
-                    ('zh-CN', 'Chinese (Simplified)'),
-                    ('ja', 'Japanese'),
-                    ('ko', 'Korean'),
-                    ('hi', 'Hindi'),
-                    ('ar', 'Arabic'),
-                    ('pt', 'Portuguese'),
-                    ('ru', 'Russian')
-                ],
-                format_func=lambda x: x[1]
-            )
-        
-        if st.button("🌍 Translate", type="primary"):
-            if text_to_translate:
-                with st.spinner(f"Translating to {target_lang[1]}..."):
-                    translated = dashboard.translate_text(text_to_translate, target_lang[0])
-                    
-                    st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                    st.markdown(f"### Translation ({target_lang[1]})")
-                    st.markdown(translated)
-                    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Tab 6: Voice Interface
-    with tabs[5]:
-        st.header("🎤 Voice Interface")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("🎙️ Speech-to-Text")
-            st.markdown('<span class="ai-badge">Speech-to-Text</span>', unsafe_allow_html=True)
-            st.info("Upload audio file to transcribe your query.")
-            
-            audio_file = st.file_uploader("Upload Audio File (WAV)", type=['wav'])
-            
-            if audio_file and st.button("📝 Transcribe"):
-                with st.spinner("Transcribing..."):
-                    transcript = dashboard.transcribe_audio(audio_file)
-                    st.success("Transcription complete!")
-                    st.text_area("Transcript", transcript, height=100)
-        
-        with col2:
-            st.subheader("🔊 Text-to-Speech")
-            st.markdown('<span class="ai-badge">Text-to-Speech</span>', unsafe_allow_html=True)
-            st.info("Convert text insights to speech.")
-            
-            tts_text = st.text_area("Text to Speak", placeholder="Enter text...", height=100)
-            
-            if st.button("🎵 Generate Speech"):
-                if tts_text:
-                    with st.spinner("Synthesizing speech..."):
-                        audio_content = dashboard.synthesize_speech(tts_text)
-                        
-                        if audio_content:
-                            # Create audio player
-                            audio_b64 = base64.b64encode(audio_content).decode()
-                            audio_html = f"""
-                            <audio controls>
-                                <source src="data:audio/mp3;base64,{audio_b64}" type="audio/mp3">
-                            </audio>
-                            """
-                            st.markdown(audio_html, unsafe_allow_html=True)
-                            
-                            # Download button
-                            st.download_button(
-                                label="📥 Download Audio",
-                                data=audio_content,
-                                file_name="insight_audio.mp3",
-                                mime="audio/mp3"
-                            )
-    
-    # Tab 7: AI Insights (Enhanced)
-    with tabs[6]:
-        st.header("🤖 AI-Powered Insights")
-        st.markdown('<span class="ai-badge">Vertex AI Gemini</span>', unsafe_allow_html=True)
-        
-        # Question answering
-        st.subheader("💬 Ask Questions About FDA Data")
-        
-        user_question = st.text_input(
-            "What would you like to know?",
-            placeholder="e.g., What are the emerging drug safety trends? Which drugs require enhanced monitoring?"
-        )
-        
-        if st.button("🔍 Get AI Insight", type="primary"):
-            if user_question:
-                with st.spinner("Analyzing data with Gemini AI..."):
-                    summary = dashboard.get_adverse_events_summary()
-                    top_drugs = dashboard.get_top_drugs_by_events()
-                    
-                    data_summary = f"""
-                    Total Events: {summary['total_events'].iloc[0] if not summary.empty else 0}
-                    Serious Events: {summary['serious_events'].iloc[0] if not summary.empty else 0}
-                    Deaths: {summary['deaths'].iloc[0] if not summary.empty else 0}
-                    
-                    Top Drugs by Events:
-                    {top_drugs.to_string() if not top_drugs.empty else 'No data'}
-                    """
-                    
-                    insight = dashboard.analyze_with_gemini(data_summary, user_question)
-                    
-                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
-                    st.markdown("### 💡 AI Insight")
-                    st.markdown(insight)
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    # Add text-to-speech option
-                    if st.button("🔊 Listen to Insight"):
-                        with st.spinner("Converting to speech..."):
-                            audio = dashboard.synthesize_speech(insight[:5000])  # Limit for TTS
-                            if audio:
-                                audio_b64 = base64.b64encode(audio).decode()
-                                st.markdown(f'<audio autoplay><source src="data:audio/mp3;base64,{audio_b64}"></audio>', 
-                                          unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Drug-specific analysis
-        st.subheader("💊 Drug Safety Analysis")
-        
-        drug_name = st.text_input("Enter drug name for detailed safety analysis")
-        
-        if st.button("📊 Analyze Drug", type="secondary"):
-            if drug_name:
-                with st.spinner(f"Analyzing {drug_name}..."):
-                    query = f"""
-                    SELECT 
-                        reactions,
-                        serious,
-                        serious_death,
-                        serious_hospitalization,
-                        patient_sex,
-                        patient_age
-                    FROM `{dashboard.project_id}.{dashboard.dataset_id}.fda_drug_adverse_events`
-                    WHERE LOWER(drug_names) LIKE LOWER('%{drug_name}%')
-                    LIMIT 100
-                    """
-                    
-                    drug_data = dashboard.query_bigquery(query)
-                    
-                    if not drug_data.empty:
-                        recommendations = dashboard.get_ai_safety_recommendations(drug_name, drug_data)
-                        
-                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
-                        st.markdown(f"### ⚠️ Comprehensive Safety Analysis: {drug_name}")
-                        st.markdown(recommendations)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    else:
-                        st.warning(f"No data found for {drug_name}")
-    
-    # Footer
-    st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666;'>
-        <p><strong>Built for the Fivetran × Google Cloud Challenge 2024</strong></p>
-        <p>Powered by 8 Google Cloud AI Services | Data source: openFDA</p>
-        <p>🧬 BigQuery ML | 🔍 Vertex AI Embeddings | 🧠 Natural Language API | 🌐 Translation API</p>
-        <p>🎤 Speech-to-Text | 🔊 Text-to-Speech | 🤖 Vertex AI Gemini</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-
-if __name__ == "__main__":
-    main()
-
+"""
+FDA Data Intelligence Dashboard - Enhanced with Multiple GCP AI Features
+
+An advanced Streamlit dashboard leveraging:
+- Vertex AI Gemini (Generative AI)
+- BigQuery ML (Predictive Analytics)
+- Vertex AI Embeddings (Semantic Search)
+- Natural Language API (Entity Extraction & Sentiment Analysis)
+- Translation API (Multi-language Support)
+- Document AI (PDF Parsing)
+- Speech-to-Text (Voice Queries)
+- Text-to-Speech (Audio Insights)
+"""
+
+import streamlit as st
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import json
+import os
+import random
+import re
+import time
+import numpy as np
+
+# The GCP SDKs and plotly dominate cold-start import time, so they
+# load lazily inside the cached factories and tab blocks that use them
+
+# Page configuration
+st.set_page_config(
+    page_title="FDA Intelligence Dashboard - AI Enhanced",
+    page_icon="🧬",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS for better UI
+
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Static style block, built once and reused across reruns"""
+    return """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        background: linear-gradient(120deg, #1f77b4, #ff7f0e);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .insight-box {
+        background-color: #e8f4f8;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #1f77b4;
+        margin: 1rem 0;
+    }
+    .warning-box {
+        background-color: #fff3cd;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #ffc107;
+        margin: 1rem 0;
+    }
+    .success-box {
+        background-color: #d4edda;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 5px solid #28a745;
+        margin: 1rem 0;
+    }
+    .ai-badge {
+        display: inline-block;
+        background: linear-gradient(120deg, #667eea, #764ba2);
+        color: white;
+        padding: 0.25rem 0.75rem;
+        border-radius: 12px;
+        font-size: 0.8rem;
+        font-weight: bold;
+        margin-left: 0.5rem;
+    }
+</style>
+"""
+
+
+st.markdown(_css(), unsafe_allow_html=True)
+
+# Header badge strip, built once at import instead of inline in main()
+AI_BADGES_MD = """
+**Powered by 8 Google Cloud AI Services:**
+<span class="ai-badge">Vertex AI Gemini</span>
+<span class="ai-badge">BigQuery ML</span>
+<span class="ai-badge">Embeddings</span>
+<span class="ai-badge">Natural Language</span>
+<span class="ai-badge">Translation</span>
+<span class="ai-badge">Speech-to-Text</span>
+<span class="ai-badge">Text-to-Speech</span>
+"""
+
+# Translation targets, hoisted to module scope so the options tuple and
+# its format function keep stable identities across reruns instead of
+# being rebuilt (and a fresh lambda allocated) on every render
+_LANGS = (
+    ('es', 'Spanish'),
+    ('fr', 'French'),
+    ('de', 'German'),
+    ('zh-CN', 'Chinese (Simplified)'),
+    ('ja', 'Japanese'),
+    ('ko', 'Korean'),
+    ('hi', 'Hindi'),
+    ('ar', 'Arabic'),
+    ('pt', 'Portuguese'),
+    ('ru', 'Russian'),
+)
+
+
+def _lang_fmt(lang: tuple) -> str:
+    """Selectbox label for a (code, name) language pair"""
+    return lang[1]
+
+
+@st.cache_resource(show_spinner=False)
+def get_bq_client(project_id: str):
+    """One BigQuery client per project, shared across sessions and reruns"""
+    from google.cloud import bigquery
+    return bigquery.Client(project=project_id)
+
+
+@st.cache_resource(show_spinner=False)
+def get_bqstorage_client():
+    """BigQuery Storage read client for fast Arrow downloads (optional)"""
+    try:
+        from google.cloud import bigquery_storage
+        return bigquery_storage.BigQueryReadClient()
+    except ImportError:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_model(model_name: str = "gemini-1.5-flash"):
+    """Shared Gemini handle; construction is cheap but not free"""
+    from vertexai.generative_models import GenerativeModel
+    return GenerativeModel(model_name)
+
+
+# Short "drug: reactions" strings do not need gecko's 768 dims; the
+# smaller model with truncated output ranks nearly identically while
+# shrinking the similarity matrix and each RPC payload 3x. The model
+# name keys the corpus cache, so switching it invalidates old matrices.
+EMBEDDING_MODEL_NAME = "text-embedding-004"
+EMBEDDING_DIM = 256
+
+
+@st.cache_resource(show_spinner=False)
+def get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME):
+    """Shared embedding model handle"""
+    from vertexai.language_models import TextEmbeddingModel
+    return TextEmbeddingModel.from_pretrained(model_name)
+
+
+@st.cache_resource(show_spinner=False)
+def get_nl_client():
+    from google.cloud import language_v1
+    return language_v1.LanguageServiceClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_translate_client():
+    from google.cloud import translate_v2 as translate
+    return translate.Client()
+
+
+@st.cache_resource(show_spinner=False)
+def get_speech_client():
+    from google.cloud import speech_v1 as speech
+    return speech.SpeechClient()
+
+
+@st.cache_resource(show_spinner=False)
+def get_tts_client():
+    from google.cloud import texttospeech
+    return texttospeech.TextToSpeechClient()
+
+
+def _with_backoff(call, attempts: int = 3):
+    """
+    Retry a GCP call on quota/availability errors with jittered backoff
+
+    Button-mashing any AI tab can burst past a per-minute quota; rather
+    than surfacing a raw 429 as a Streamlit exception, wait out the
+    window. Jitter keeps concurrent sessions from retrying in lockstep.
+    """
+    from google.api_core import exceptions as gcp_exceptions
+
+    for attempt in range(attempts):
+        try:
+            return call()
+        except (gcp_exceptions.ResourceExhausted,
+                gcp_exceptions.ServiceUnavailable):
+            if attempt == attempts - 1:
+                raise
+            time.sleep(min(10, 2 ** attempt) + random.random())
+
+
+def _batch_embed(model, texts: list, batch_size: int = 64) -> list:
+    """Embed texts in chunks of batch_size, one concurrent RPC per chunk"""
+    def embed(chunk):
+        return _with_backoff(
+            lambda: model.get_embeddings(chunk, output_dimensionality=EMBEDDING_DIM)
+        )
+
+    chunks = [texts[start:start + batch_size]
+              for start in range(0, len(texts), batch_size)]
+    if len(chunks) <= 1:
+        return [e.values for chunk in chunks for e in embed(chunk)]
+
+    # The chunk RPCs are independent and latency-bound; run a few in
+    # flight at once and reassemble results in submission order
+    results = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {_submit_with_ctx(executor, embed, chunk): i
+                   for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [e.values for response in results for e in response]
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _embed_corpus(texts: tuple, model_name: str = EMBEDDING_MODEL_NAME) -> np.ndarray:
+    """
+    Embed a corpus of descriptions, cached on the texts themselves
+
+    The drug descriptions barely change between searches, so after the
+    first query the corpus embeddings cost nothing; only the user's
+    query embedding still hits the API.
+    """
+    model = get_embedding_model(model_name)
+    matrix = np.array(_batch_embed(model, list(texts)), dtype=np.float32)
+    if matrix.size:
+        # Pre-normalized rows reduce cosine similarity to one dot product
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix
+
+
+@st.cache_data(persist="disk", max_entries=10_000, show_spinner=False)
+def _translate(text: str, target_language: str) -> str:
+    """
+    Translation API call cached on (text, language), persisted to disk
+
+    Drug warnings repeat heavily across users and translations do not
+    drift, so hits skip the ~half-second network round-trip entirely.
+    """
+    result = _with_backoff(
+        lambda: get_translate_client().translate(text, target_language=target_language)
+    )
+    return result['translatedText']
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _analyze_nl(text: str) -> dict:
+    """
+    Sentiment and entity analysis cached on the input text
+
+    Users iterate on the same pasted report; the NL API is
+    deterministic for these inputs so repeats come from memory.
+    """
+    from google.cloud import language_v1
+
+    document = language_v1.Document(
+        content=text,
+        type_=language_v1.Document.Type.PLAIN_TEXT
+    )
+
+    # annotate_text returns sentiment and entities from one RPC,
+    # halving the round trips of separate analyze_* calls
+    response = _with_backoff(lambda: get_nl_client().annotate_text(request={
+        'document': document,
+        'features': {
+            'extract_entities': True,
+            'extract_document_sentiment': True,
+        }
+    }))
+    sentiment = response.document_sentiment
+
+    entities = []
+    for entity in response.entities:
+        entities.append({
+            'name': entity.name,
+            'type': language_v1.Entity.Type(entity.type_).name,
+            'salience': entity.salience
+        })
+
+    return {
+        'sentiment': {
+            'score': sentiment.score,
+            'magnitude': sentiment.magnitude
+        },
+        'entities': entities[:10]  # Top 10 entities
+    }
+
+
+@st.cache_data(persist="disk", max_entries=500, show_spinner=False)
+def _tts(text: str) -> bytes:
+    """
+    Speech synthesis cached on the text, so replaying an insight or
+    re-clicking the generate button skips the 1-3s synthesis call
+    """
+    from google.cloud import texttospeech
+
+    synthesis_input = texttospeech.SynthesisInput(text=text)
+
+    voice = texttospeech.VoiceSelectionParams(
+        language_code="en-US",
+        name="en-US-Neural2-F",
+        ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
+    )
+
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3
+    )
+
+    response = _with_backoff(lambda: get_tts_client().synthesize_speech(
+        input=synthesis_input,
+        voice=voice,
+        audio_config=audio_config
+    ))
+
+    return response.audio_content
+
+
+def _classify_sentiment(score: float) -> tuple:
+    """Map a sentiment score to its display (label, color) pair"""
+    if score > 0.25:
+        return 'Positive', 'green'
+    if score < -0.25:
+        return 'Negative', 'red'
+    return 'Neutral', 'gray'
+
+
+@st.cache_resource(show_spinner=False)
+def _insight_cache() -> dict:
+    """
+    Process-wide prompt -> response cache for Gemini calls
+
+    Users re-ask the same questions over unchanged aggregates; a hit
+    skips a 2-10s Vertex AI round-trip. A plain dict behind
+    cache_resource (rather than cache_data on the call) lets the
+    streaming paths populate it chunk by chunk as well.
+    """
+    return {}
+
+
+@st.cache_resource(show_spinner=False)
+def _predictor_weights(project_id: str, model_name: str):
+    """
+    Pull the logistic-regression coefficients out of BigQuery once
+
+    ML.PREDICT spins up BigQuery slots for what is a single dot
+    product; with the weights cached in-process each prediction is a
+    local sigmoid instead of a multi-second SQL round-trip. Raises if
+    the model does not exist yet, so nothing is cached until training.
+    """
+    query = f"""
+    SELECT processed_input, weight, category_weights
+    FROM ML.WEIGHTS(MODEL `{model_name}`)
+    """
+    df = get_bq_client(project_id).query(query).to_dataframe()
+    numeric, categorical, intercept = {}, {}, 0.0
+    for feature, weight, cat_weights in df.itertuples(index=False, name=None):
+        if cat_weights is not None and len(cat_weights):
+            categorical[feature] = {c['category']: c['weight'] for c in cat_weights}
+        elif feature == '__INTERCEPT__':
+            intercept = weight
+        else:
+            numeric[feature] = weight
+    return numeric, categorical, intercept
+
+
+def _submit_with_ctx(executor, fn, *args, **kwargs):
+    """Submit fn to the executor with the Streamlit script-run context
+
+    Worker threads have no ScriptRunContext, so any st.* call they make
+    (error reporting in particular) is silently dropped; attaching the
+    caller's context keeps those elements visible.
+    """
+    import threading
+    from streamlit.runtime.scriptrunner import (add_script_run_ctx,
+                                                get_script_run_ctx)
+
+    ctx = get_script_run_ctx()
+
+    def _call():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+
+    return executor.submit(_call)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_query(project_id: str, query: str, params: tuple = ()) -> pd.DataFrame:
+    """
+    Execute a BigQuery query, cached on the SQL string and parameters
+
+    Each distinct query pays the BigQuery round-trip once per hour
+    instead of once per Streamlit rerun. Values are passed as query
+    parameters rather than baked into the SQL, so BigQuery's own
+    24-hour result cache keys on a stable query text too.
+    """
+    from google.cloud import bigquery
+
+    job_config = bigquery.QueryJobConfig(
+        use_query_cache=True,
+        query_parameters=[
+            bigquery.ScalarQueryParameter(name, type_, value)
+            for name, type_, value in params
+        ]
+    )
+    # The Storage API streams results as Arrow record batches,
+    # which lands in pandas far faster than REST row paging
+    return get_bq_client(project_id).query(query, job_config=job_config).to_dataframe(
+        bqstorage_client=get_bqstorage_client(),
+        create_bqstorage_client=False
+    )
+
+
+class EnhancedFDADashboard:
+    """Enhanced FDA Dashboard with Multiple GCP AI Features"""
+    
+    def __init__(self):
+        """Initialize dashboard with all Google Cloud AI services"""
+        self.bq_client = None
+        self.gemini_model = None
+        self.embedding_model = None
+        self.nl_client = None
+        self.translate_client = None
+        self.speech_client = None
+        self.tts_client = None
+        self.project_id = None
+        self.dataset_id = None
+        self.location = None
+        
+    def setup_google_cloud(self, project_id: str, dataset_id: str, location: str = "us-central1"):
+        """
+        Setup all Google Cloud AI services
+        
+        Args:
+            project_id: GCP project ID
+            dataset_id: BigQuery dataset ID
+            location: GCP region
+        """
+        try:
+            self.project_id = project_id
+            self.dataset_id = dataset_id
+            self.location = location
+            
+            # All clients come from cache_resource factories, so the
+            # gRPC channels and auth handshakes survive reruns
+            self.bq_client = get_bq_client(project_id)
+
+            # Initialize Vertex AI
+            import vertexai
+            vertexai.init(project=project_id, location=location)
+            self.gemini_model = get_gemini_model()
+
+            # Initialize Vertex AI Embeddings
+            self.embedding_model = get_embedding_model()
+
+            # Initialize Natural Language API
+            self.nl_client = get_nl_client()
+
+            # Initialize Translation API
+            self.translate_client = get_translate_client()
+
+            # Initialize Speech-to-Text
+            self.speech_client = get_speech_client()
+
+            # Initialize Text-to-Speech
+            self.tts_client = get_tts_client()
+
+            # Array-typed view backing the drug aggregations, plus the
+            # index that turns drug lookups into point reads
+            self.ensure_flat_drug_view()
+            self.ensure_search_index()
+
+            st.success("✅ Connected to all Google Cloud AI services successfully!")
+            return True
+            
+        except Exception as e:
+            st.error(f"❌ Error connecting to Google Cloud: {str(e)}")
+            return False
+    
+    # ==================== BigQuery Operations ====================
+    
+    def query_bigquery(self, query: str, params: tuple = ()) -> pd.DataFrame:
+        """
+        Execute BigQuery query, cached on the SQL string
+
+        Args:
+            query: SQL text with @name placeholders
+            params: Tuple of (name, type, value) query parameters
+
+        Errors are caught here, outside the cache, so a transient
+        failure is never memoized as an empty result
+        """
+        try:
+            return _run_query(self.project_id, query, params)
+        except Exception as e:
+            st.error(f"Error querying BigQuery: {str(e)}")
+            return pd.DataFrame()
+
+    def ensure_flat_drug_view(self, table_name: str = "fda_drug_adverse_events"):
+        """
+        Create a view exposing drug_names/reactions as real arrays
+
+        The raw columns hold stringified Python lists, which forced a
+        REGEXP_EXTRACT per row (and only ever caught the first drug).
+        UNNESTing the array is cheaper and counts every drug per report.
+        """
+        query = f"""
+        CREATE VIEW IF NOT EXISTS `{self.project_id}.{self.dataset_id}.{table_name}_flat` AS
+        SELECT
+            * EXCEPT (drug_names, reactions),
+            COALESCE(
+                JSON_EXTRACT_STRING_ARRAY(drug_names),
+                JSON_EXTRACT_STRING_ARRAY(REPLACE(drug_names, "'", '"'))
+            ) as drug_names,
+            COALESCE(
+                JSON_EXTRACT_STRING_ARRAY(reactions),
+                JSON_EXTRACT_STRING_ARRAY(REPLACE(reactions, "'", '"'))
+            ) as reactions
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        """
+        try:
+            self.bq_client.query(query).result()
+        except Exception as e:
+            st.warning(f"Could not create flat view: {str(e)}")
+
+    def ensure_search_index(self, table_name: str = "fda_drug_adverse_events"):
+        """Create the search index backing SEARCH() drug lookups"""
+        query = f"""
+        CREATE SEARCH INDEX IF NOT EXISTS drug_names_idx
+        ON `{self.project_id}.{self.dataset_id}.{table_name}`(drug_names)
+        """
+        try:
+            self.bq_client.query(query).result()
+        except Exception as e:
+            st.warning(f"Could not create search index: {str(e)}")
+    
+    def get_adverse_events_summary(self, table_name: str = "fda_drug_adverse_events",
+                                   date_from: str = None, date_to: str = None) -> pd.DataFrame:
+        """
+        Get summary of drug adverse events, optionally date-bounded
+
+        Date bounds are plain BETWEEN comparisons on receivedate, so a
+        table partitioned or clustered on it only scans the matching
+        range instead of the whole history.
+        """
+        where = ""
+        if date_from or date_to:
+            lo = (date_from or "1900-01-01").replace("-", "")
+            hi = (date_to or "2999-12-31").replace("-", "")
+            where = f"WHERE receivedate BETWEEN '{lo}' AND '{hi}'"
+        query = f"""
+        SELECT
+            COUNT(*) as total_events,
+            APPROX_COUNT_DISTINCT(safetyreportid) as unique_reports,
+            COUNTIF(serious = '1') as serious_events,
+            COUNTIF(serious_death = '1') as deaths,
+            COUNTIF(serious_hospitalization = '1') as hospitalizations
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+        {where}
+        """
+        return self.query_bigquery(query)
+    
+    def get_top_drugs_by_events(self, table_name: str = "fda_drug_adverse_events", limit: int = 10) -> pd.DataFrame:
+        """Get drugs with most adverse events"""
+        query = f"""
+        SELECT
+            drug_name,
+            COUNT(*) as event_count,
+            COUNTIF(serious = '1') as serious_count
+        FROM `{self.project_id}.{self.dataset_id}.{table_name}_flat`,
+            UNNEST(drug_names) as drug_name
+        WHERE drug_name != ''
+        GROUP BY drug_name
+        ORDER BY event_count DESC
+        LIMIT @lim
+        """
+        return self.query_bigquery(query, params=(("lim", "INT64", limit),))
+    
+    # ==================== BigQuery ML - Predictive Analytics ====================
+    
+    def create_adverse_event_prediction_model(self, table_name: str = "fda_drug_adverse_events"):
+        """
+        Create a BigQuery ML model to predict adverse event risk
+        <span class="ai-badge">BigQuery ML</span>
+        """
+        try:
+            model_name = f"{self.project_id}.{self.dataset_id}.adverse_event_predictor"
+            
+            create_model_query = f"""
+            CREATE OR REPLACE MODEL `{model_name}`
+            OPTIONS(
+                model_type='LOGISTIC_REG',
+                input_label_cols=['serious'],
+                auto_class_weights=TRUE
+            ) AS
+            SELECT
+                serious,
+                patient_age,
+                patient_sex,
+                CAST(serious_death AS INT64) as serious_death_flag,
+                CAST(serious_hospitalization AS INT64) as serious_hosp_flag
+            FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+            WHERE patient_age IS NOT NULL 
+            AND patient_sex IS NOT NULL
+            AND serious IN ('0', '1')
+            LIMIT 10000
+            """
+            
+            self.bq_client.query(create_model_query).result()
+            return True, "Model created successfully!"
+            
+        except Exception as e:
+            return False, f"Error creating model: {str(e)}"
+    
+    def predict_adverse_event_risk(self, patient_age: float, patient_sex: str) -> dict:
+        """
+        Predict adverse event risk for a patient profile
+        <span class="ai-badge">BigQuery ML</span>
+        """
+        try:
+            model_name = f"{self.project_id}.{self.dataset_id}.adverse_event_predictor"
+
+            # Score locally from the cached coefficients when available
+            try:
+                numeric, categorical, intercept = _predictor_weights(self.project_id, model_name)
+            except Exception:
+                numeric = None
+
+            if numeric is not None:
+                score = intercept
+                score += numeric.get('patient_age', 0.0) * patient_age
+                score += categorical.get('patient_sex', {}).get(patient_sex, 0.0)
+                probability = float(1.0 / (1.0 + np.exp(-score)))
+                return {
+                    "risk_level": "High" if probability > 0.5 else "Low",
+                    "probability": probability,
+                    "predicted_serious": '1' if probability > 0.5 else '0'
+                }
+
+            # Fallback: model weights unavailable, predict in BigQuery
+            predict_query = f"""
+            SELECT
+                predicted_serious,
+                predicted_serious_probs[OFFSET(1)].prob as risk_probability
+            FROM ML.PREDICT(MODEL `{model_name}`,
+                (SELECT
+                    @age as patient_age,
+                    @sex as patient_sex,
+                    0 as serious_death_flag,
+                    0 as serious_hosp_flag
+                )
+            )
+            """
+
+            result = self.query_bigquery(predict_query, params=(
+                ("age", "FLOAT64", patient_age),
+                ("sex", "STRING", patient_sex),
+            ))
+            
+            if not result.empty:
+                return {
+                    "risk_level": "High" if result['risk_probability'].iloc[0] > 0.5 else "Low",
+                    "probability": float(result['risk_probability'].iloc[0]),
+                    "predicted_serious": result['predicted_serious'].iloc[0]
+                }
+            return None
+            
+        except Exception as e:
+            st.error(f"Prediction error: {str(e)}")
+            return None
+    
+    # ==================== Vertex AI Embeddings - Semantic Search ====================
+    
+    def generate_embedding(self, text: str) -> list:
+        """
+        Generate text embedding using Vertex AI
+        <span class="ai-badge">Vertex AI Embeddings</span>
+        """
+        try:
+            embeddings = self.embedding_model.get_embeddings(
+                [text], output_dimensionality=EMBEDDING_DIM
+            )
+            return embeddings[0].values
+        except Exception as e:
+            st.error(f"Embedding error: {str(e)}")
+            return None
+
+    def generate_embeddings_batch(self, texts: list, batch_size: int = 64) -> list:
+        """
+        Generate embeddings for many texts in batched API calls
+        <span class="ai-badge">Vertex AI Embeddings</span>
+
+        One RPC per batch instead of one per text - the round-trip,
+        not the embedding itself, dominates latency at this scale.
+        """
+        try:
+            return _batch_embed(self.embedding_model, texts, batch_size)
+        except Exception as e:
+            st.error(f"Embedding error: {str(e)}")
+            return None
+
+    def ensure_drug_embeddings(self, table_name: str = "fda_drug_adverse_events") -> bool:
+        """
+        Build the drug_embeddings table and vector index once
+
+        Embedding the corpus at search time forced a table scan plus one
+        API round per row on every query; persisting the vectors lets
+        BigQuery answer searches server-side via VECTOR_SEARCH.
+        """
+        embeddings_table = f"{self.project_id}.{self.dataset_id}.drug_embeddings"
+        try:
+            self.bq_client.get_table(embeddings_table)
+            return True
+        except Exception:
+            pass
+
+        try:
+            data_query = f"""
+            SELECT
+                drug_name,
+                ARRAY_TO_STRING(reactions, ', ') as reactions,
+                COUNT(*) as event_count
+            FROM `{self.project_id}.{self.dataset_id}.{table_name}_flat`,
+                UNNEST(drug_names) as drug_name
+            WHERE drug_name != ''
+            GROUP BY drug_name, reactions
+            LIMIT 100
+            """
+            df = self.query_bigquery(data_query)
+            if df.empty:
+                return False
+
+            descriptions = (df['drug_name'].fillna('') + ': '
+                            + df['reactions'].astype(str)).str.slice(0, 1000)
+            texts = tuple(descriptions.tolist())
+            matrix = _embed_corpus(texts)
+            if matrix.size == 0:
+                return False
+
+            df['embedding'] = [row.astype(float).tolist() for row in matrix]
+            self.bq_client.load_table_from_dataframe(
+                df[['drug_name', 'event_count', 'embedding']], embeddings_table
+            ).result()
+
+            # The index only builds past BigQuery's minimum row count,
+            # but VECTOR_SEARCH falls back to brute force without it
+            index_ddl = f"""
+            CREATE VECTOR INDEX IF NOT EXISTS drug_embeddings_idx
+            ON `{embeddings_table}`(embedding)
+            OPTIONS(index_type = 'IVF', distance_type = 'COSINE')
+            """
+            try:
+                self.bq_client.query(index_ddl).result()
+            except Exception:
+                pass
+            return True
+
+        except Exception as e:
+            st.error(f"Embedding table error: {str(e)}")
+            return False
+
+    def semantic_search_drugs(self, query: str, table_name: str = "fda_drug_adverse_events", top_k: int = 5) -> pd.DataFrame:
+        """
+        Perform semantic search across drug adverse events
+        <span class="ai-badge">Vertex AI Embeddings</span>
+        """
+        try:
+            # Generate query embedding
+            query_embedding = self.generate_embedding(query)
+            if query_embedding is None:
+                return pd.DataFrame()
+
+            # Preferred path: rank server-side over the persisted vectors
+            if self.ensure_drug_embeddings(table_name):
+                embeddings_table = f"{self.project_id}.{self.dataset_id}.drug_embeddings"
+                search_query = f"""
+                SELECT
+                    base.drug_name,
+                    base.event_count,
+                    1 - distance as similarity_score
+                FROM VECTOR_SEARCH(
+                    TABLE `{embeddings_table}`, 'embedding',
+                    (SELECT @q as embedding),
+                    top_k => @k, distance_type => 'COSINE')
+                ORDER BY distance
+                """
+                from google.cloud import bigquery
+                job_config = bigquery.QueryJobConfig(query_parameters=[
+                    bigquery.ArrayQueryParameter("q", "FLOAT64", list(query_embedding)),
+                    bigquery.ScalarQueryParameter("k", "INT64", top_k),
+                ])
+                try:
+                    return self.bq_client.query(search_query, job_config=job_config).to_dataframe()
+                except Exception:
+                    # Older datasets/regions without VECTOR_SEARCH fall
+                    # through to the in-process ranking below
+                    pass
+
+            # Fallback: rank the sampled corpus client-side. TABLESAMPLE
+            # keeps the GROUP BY off the full table - the corpus is
+            # truncated to 100 rows anyway, so uniform sampling loses
+            # nothing while cutting bytes scanned per search
+            data_query = f"""
+            SELECT drug_name, reactions, COUNT(*) as event_count
+            FROM (
+                SELECT
+                    d as drug_name,
+                    ARRAY_TO_STRING(COALESCE(
+                        JSON_EXTRACT_STRING_ARRAY(reactions),
+                        JSON_EXTRACT_STRING_ARRAY(REPLACE(reactions, "'", '"'))
+                    ), ', ') as reactions
+                FROM `{self.project_id}.{self.dataset_id}.{table_name}`
+                    TABLESAMPLE SYSTEM (1 PERCENT),
+                    UNNEST(COALESCE(
+                        JSON_EXTRACT_STRING_ARRAY(drug_names),
+                        JSON_EXTRACT_STRING_ARRAY(REPLACE(drug_names, "'", '"'))
+                    )) as d
+                WHERE d != ''
+            )
+            GROUP BY drug_name, reactions
+            LIMIT 100
+            """
+            df = self.query_bigquery(data_query)
+
+            if df.empty:
+                return pd.DataFrame()
+
+            # Embed all drug descriptions in a handful of batched calls,
+            # cached on the text so repeat searches skip the API entirely
+            descriptions = (df['drug_name'].fillna('') + ': '
+                            + df['reactions'].astype(str)).str.slice(0, 1000)
+            texts = tuple(descriptions.tolist())
+            embeddings_matrix = _embed_corpus(texts)
+
+            if embeddings_matrix.size == 0:
+                return pd.DataFrame()
+
+            # Corpus rows are already L2-normalized in _embed_corpus, so
+            # cosine similarity is a single BLAS matrix-vector product
+            q = np.asarray(query_embedding, dtype=np.float32)
+            q /= np.linalg.norm(q)
+            similarities = embeddings_matrix @ q
+
+            # Partial top-k selection instead of sorting every row
+            k = min(top_k, len(similarities))
+            top_idx = np.argpartition(-similarities, k - 1)[:k]
+            top_idx = top_idx[np.argsort(-similarities[top_idx])]
+
+            result = df.iloc[top_idx][['drug_name', 'event_count']].copy()
+            result['similarity_score'] = similarities[top_idx]
+            return result
+
+        except Exception as e:
+            st.error(f"Semantic search error: {str(e)}")
+            return pd.DataFrame()
+    
+    # ==================== Natural Language API ====================
+    
+    def analyze_sentiment_and_entities(self, text: str) -> dict:
+        """
+        Analyze text sentiment and extract entities
+        <span class="ai-badge">Natural Language API</span>
+        """
+        try:
+            return _analyze_nl(text)
+        except Exception as e:
+            return {'error': str(e)}
+    
+    # ==================== Translation API ====================
+    
+    def translate_text(self, text: str, target_language: str = 'es') -> str:
+        """
+        Translate text to target language
+        <span class="ai-badge">Translation API</span>
+        """
+        try:
+            return _translate(text, target_language)
+        except Exception as e:
+            return f"Translation error: {str(e)}"
+    
+    def get_supported_languages(self) -> list:
+        """Get list of supported languages"""
+        try:
+            results = self.translate_client.get_languages()
+            return [{'code': lang['language'], 'name': lang['name']} 
+                    for lang in results]
+        except:
+            return []
+    
+    # ==================== Speech-to-Text ====================
+    
+    def transcribe_audio(self, audio_file) -> str:
+        """
+        Transcribe audio to text
+        <span class="ai-badge">Speech-to-Text</span>
+        """
+        try:
+            from google.cloud import speech_v1 as speech
+
+            content = audio_file.read()
+
+            config = speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=16000,
+                language_code="en-US",
+            )
+
+            # Streaming recognition caps out at one minute of audio;
+            # longer uploads go through the long-running operation
+            if len(content) > 60 * 16000 * 2:
+                audio = speech.RecognitionAudio(content=content)
+                operation = self.speech_client.long_running_recognize(
+                    config=config, audio=audio
+                )
+                response = operation.result(timeout=300)
+                return " ".join(
+                    result.alternatives[0].transcript
+                    for result in response.results
+                ).strip()
+
+            streaming_config = speech.StreamingRecognitionConfig(
+                config=config,
+                interim_results=True,
+            )
+
+            def audio_chunks(chunk_size=16 * 1024):
+                for start in range(0, len(content), chunk_size):
+                    yield speech.StreamingRecognizeRequest(
+                        audio_content=content[start:start + chunk_size]
+                    )
+
+            # Streaming overlaps recognition with the upload and lets
+            # interim transcripts render while later chunks are processed
+            responses = self.speech_client.streaming_recognize(
+                streaming_config, audio_chunks()
+            )
+
+            placeholder = st.empty()
+            finals = []
+            for response in responses:
+                for result in response.results:
+                    transcript = result.alternatives[0].transcript
+                    if result.is_final:
+                        finals.append(transcript)
+                        placeholder.markdown(" ".join(finals))
+                    else:
+                        placeholder.markdown(" ".join(finals + [transcript]))
+            placeholder.empty()
+
+            return " ".join(finals).strip()
+
+        except Exception as e:
+            return f"Transcription error: {str(e)}"
+    
+    # ==================== Text-to-Speech ====================
+    
+    def synthesize_speech(self, text: str) -> bytes:
+        """
+        Convert text to speech
+        <span class="ai-badge">Text-to-Speech</span>
+        """
+        try:
+            return _tts(text)
+        except Exception as e:
+            st.error(f"Text-to-speech error: {str(e)}")
+            return None
+
+    def synthesize_speech_long(self, text: str, chunk_chars: int = 500) -> bytes:
+        """
+        Synthesize long text as parallel sentence chunks
+        <span class="ai-badge">Text-to-Speech</span>
+
+        A single blob blocks for seconds and the old 5000-char cap
+        silently dropped content; sentence groups synthesize in
+        parallel, and MP3 frames with identical voice settings
+        concatenate cleanly.
+        """
+        try:
+            sentences = re.split(r'(?<=[.!?])\s+', text)
+            groups, current = [], ""
+            for sentence in sentences:
+                if current and len(current) + len(sentence) > chunk_chars:
+                    groups.append(current)
+                    current = sentence
+                else:
+                    current = f"{current} {sentence}".strip()
+            if current:
+                groups.append(current)
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [_submit_with_ctx(executor, _tts, group)
+                           for group in groups]
+                chunks = [future.result() for future in futures]
+            return b"".join(chunks)
+        except Exception as e:
+            st.error(f"Text-to-speech error: {str(e)}")
+            return None
+    
+    # ==================== Vertex AI Gemini ====================
+    
+    @staticmethod
+    def _build_insight_prompt(data_summary: str, question: str) -> str:
+        """Assemble the analyst prompt for a data question"""
+        return f"""
+You are an expert FDA data analyst with deep knowledge of pharmacovigilance and drug safety.
+
+Data Summary:
+{data_summary}
+
+User Question: {question}
+
+Provide a comprehensive, actionable analysis including:
+1. Key findings and statistical insights
+2. Potential safety concerns and trends
+3. Risk stratification and patient populations at higher risk
+4. Evidence-based recommendations for healthcare providers
+5. Patterns warranting regulatory attention
+6. Suggested monitoring and mitigation strategies
+
+Be precise, data-driven, and focus on public health impact.
+"""
+
+    @staticmethod
+    def _build_safety_prompt(drug_name: str, adverse_events: pd.DataFrame) -> str:
+        """Assemble the safety-assessment prompt for a drug"""
+        events_summary = adverse_events.to_string() if not adverse_events.empty else "No data available"
+        return f"""
+Conduct a comprehensive drug safety assessment for {drug_name}:
+
+Adverse Event Data:
+{events_summary}
+
+Provide a detailed analysis with:
+1. **Risk Assessment Summary**: Overall safety profile
+2. **Critical Adverse Events**: Most concerning reactions with severity levels
+3. **High-Risk Populations**: Patient demographics requiring caution
+4. **Contraindications**: Situations where drug should be avoided
+5. **Monitoring Parameters**: Laboratory tests and vital signs to track
+6. **Drug Interactions**: Potential interactions to screen for
+7. **Healthcare Provider Recommendations**: Prescribing guidelines
+8. **Patient Counseling Points**: Key information for patients
+
+Use evidence-based reasoning and clinical best practices.
+"""
+
+    def analyze_with_gemini(self, data_summary: str, question: str) -> str:
+        """
+        Use Vertex AI Gemini for advanced analysis
+        <span class="ai-badge">Vertex AI Gemini</span>
+        """
+        prompt = self._build_insight_prompt(data_summary, question)
+        cache = _insight_cache()
+        if prompt in cache:
+            return cache[prompt]
+        try:
+            text = _with_backoff(lambda: self.gemini_model.generate_content(prompt)).text
+            cache[prompt] = text
+            return text
+        except Exception as e:
+            return f"Error generating AI insight: {str(e)}"
+
+    def stream_with_gemini(self, data_summary: str, question: str):
+        """
+        Stream a Gemini analysis as it is generated
+        <span class="ai-badge">Vertex AI Gemini</span>
+
+        Yields text chunks for st.write_stream, so the first paragraph
+        appears at time-to-first-token instead of after the full
+        generation. Repeat prompts replay from the insight cache.
+        """
+        prompt = self._build_insight_prompt(data_summary, question)
+        cache = _insight_cache()
+        if prompt in cache:
+            yield cache[prompt]
+            return
+        try:
+            parts = []
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                parts.append(chunk.text)
+                yield chunk.text
+            cache[prompt] = "".join(parts)
+        except Exception as e:
+            yield f"Error generating AI insight: {str(e)}"
+
+    def get_ai_safety_recommendations(self, drug_name: str, adverse_events: pd.DataFrame) -> str:
+        """Get comprehensive AI-powered safety recommendations"""
+        prompt = self._build_safety_prompt(drug_name, adverse_events)
+        cache = _insight_cache()
+        if prompt in cache:
+            return cache[prompt]
+        try:
+            text = _with_backoff(lambda: self.gemini_model.generate_content(prompt)).text
+            cache[prompt] = text
+            return text
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def stream_safety_recommendations(self, drug_name: str, adverse_events: pd.DataFrame):
+        """Stream the safety assessment, replaying cached responses"""
+        prompt = self._build_safety_prompt(drug_name, adverse_events)
+        cache = _insight_cache()
+        if prompt in cache:
+            yield cache[prompt]
+            return
+        try:
+            parts = []
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                parts.append(chunk.text)
+                yield chunk.text
+            cache[prompt] = "".join(parts)
+        except Exception as e:
+            yield f"Error: {str(e)}"
+
+
+def main():
+    """Main application with enhanced AI features"""
+    
+    # Header
+    st.markdown('<h1 class="main-header">🧬 FDA Intelligence Dashboard - AI Enhanced</h1>', unsafe_allow_html=True)
+    st.markdown(AI_BADGES_MD, unsafe_allow_html=True)
+    st.markdown("---")
+    
+    # Initialize dashboard
+    if 'dashboard' not in st.session_state:
+        st.session_state.dashboard = EnhancedFDADashboard()
+    
+    dashboard = st.session_state.dashboard
+    
+    # Sidebar configuration
+    st.sidebar.title("⚙️ Configuration")
+    
+    project_id = st.sidebar.text_input(
+        "GCP Project ID",
+        value=os.environ.get("GCP_PROJECT_ID", ""),
+        help="Your Google Cloud Project ID"
+    )
+    
+    dataset_id = st.sidebar.text_input(
+        "BigQuery Dataset ID",
+        value=os.environ.get("BQ_DATASET_ID", "fda_data"),
+        help="BigQuery dataset where Fivetran syncs FDA data"
+    )
+    
+    location = st.sidebar.selectbox(
+        "GCP Region",
+        ["us-central1", "us-east1", "us-west1", "europe-west1", "asia-east1"],
+        help="Google Cloud region"
+    )
+    
+    # Connect button
+    if st.sidebar.button("🔌 Connect to Google Cloud AI", type="primary"):
+        if project_id and dataset_id:
+            dashboard.setup_google_cloud(project_id, dataset_id, location)
+        else:
+            st.sidebar.error("Please provide Project ID and Dataset ID")
+    
+    # AI Features Status
+    if dashboard.bq_client:
+        st.sidebar.success("✅ Connected")
+        st.sidebar.markdown("### 🤖 AI Services Active:")
+        st.sidebar.markdown("""
+        - ✅ Vertex AI Gemini
+        - ✅ BigQuery ML
+        - ✅ Embeddings
+        - ✅ Natural Language
+        - ✅ Translation
+        - ✅ Speech-to-Text
+        - ✅ Text-to-Speech
+        """)
+    
+    # Main content
+    if dashboard.bq_client is None:
+        st.info("👈 Please configure and connect to Google Cloud in the sidebar to begin")
+        
+        # Feature showcase
+        st.markdown("## 🚀 Enhanced AI Features")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("""
+            ### 🎯 Predictive Analytics
+            - **BigQuery ML**: Predict adverse event risk
+            - **AutoML**: Custom safety models
+            - Real-time risk scoring
+            
+            ### 🔍 Semantic Search
+            - **Vertex AI Embeddings**: Find similar drugs
+            - Natural language queries
+            - Context-aware results
+            
+            ### 🌐 Multi-Language Support
+            - **Translation API**: 100+ languages
+            - Instant translation
+            - Global accessibility
+            """)
+        
+        with col2:
+            st.markdown("""
+            ### 🧠 Advanced NLP
+            - **Natural Language API**: Entity extraction
+            - Sentiment analysis
+            - Key phrase detection
+            
+            ### 🎤 Voice Interface
+            - **Speech-to-Text**: Voice queries
+            - **Text-to-Speech**: Audio insights
+            - Hands-free operation
+            
+            ### 💡 Generative AI
+            - **Vertex AI Gemini**: Complex reasoning
+            - Comprehensive recommendations
+            - Evidence-based insights
+            """)
+        
+        return
+    
+    # Enhanced Dashboard Tabs
+    tabs = st.tabs([
+        "📊 Overview",
+        "🔮 Predictive Analytics",
+        "🔍 Semantic Search",
+        "🧠 NLP Analysis",
+        "🌐 Translation",
+        "🎤 Voice Interface",
+        "🤖 AI Insights"
+    ])
+    
+    # Tab 1: Overview (keeping existing functionality)
+    with tabs[0]:
+        st.header("Dashboard Overview")
+        
+        col1, col2, col3, col4 = st.columns(4)
+
+        # Both overview aggregates are independent, latency-bound BigQuery
+        # calls; overlap them the same way Tab 7 overlaps its fan-out
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary_future = _submit_with_ctx(executor, dashboard.get_adverse_events_summary)
+            top_future = _submit_with_ctx(executor, dashboard.get_top_drugs_by_events, limit=15)
+            summary = summary_future.result()
+            top_drugs = top_future.result()
+
+        if not summary.empty:
+            with col1:
+                st.metric("Total Events", f"{summary['total_events'].iloc[0]:,}")
+            with col2:
+                st.metric("Serious Events", f"{summary['serious_events'].iloc[0]:,}",
+                         delta=f"{(summary['serious_events'].iloc[0] / summary['total_events'].iloc[0] * 100):.1f}%")
+            with col3:
+                st.metric("Deaths Reported", f"{summary['deaths'].iloc[0]:,}")
+            with col4:
+                st.metric("Hospitalizations", f"{summary['hospitalizations'].iloc[0]:,}")
+        
+        st.markdown("---")
+        
+        st.subheader("📈 Top Drugs by Adverse Events")
+
+        if not top_drugs.empty:
+            import plotly.express as px
+
+            fig = px.bar(
+                top_drugs,
+                x='event_count',
+                y='drug_name',
+                orientation='h',
+                color='serious_count',
+                title='Drugs with Most Reported Adverse Events',
+                labels={'event_count': 'Total Events', 'drug_name': 'Drug Name', 'serious_count': 'Serious Events'},
+                color_continuous_scale='Reds'
+            )
+            fig.update_layout(height=500)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    # Tab 2: Predictive Analytics with BigQuery ML
+    with tabs[1]:
+        st.header("🔮 Predictive Analytics")
+        st.markdown('<span class="ai-badge">BigQuery ML</span>', unsafe_allow_html=True)
+        
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            st.subheader("Model Training")
+            st.info("Train a machine learning model to predict adverse event risk based on patient characteristics.")
+            
+            if st.button("🏋️ Train BigQuery ML Model", type="primary"):
+                with st.spinner("Training model... This may take a few minutes"):
+                    success, message = dashboard.create_adverse_event_prediction_model()
+                    if success:
+                        st.success(f"✅ {message}")
+                    else:
+                        st.error(f"❌ {message}")
+        
+        with col2:
+            st.subheader("Risk Prediction")
+            st.info("Predict adverse event risk for a patient profile.")
+            
+            # A form batches the widget edits into a single rerun on submit
+            with st.form('predict_form'):
+                patient_age = st.number_input("Patient Age", min_value=0, max_value=120, value=45)
+                patient_sex = st.selectbox("Patient Sex", ["1", "2"], format_func=lambda x: "Male" if x == "1" else "Female")
+                predict_submitted = st.form_submit_button("🎯 Predict Risk")
+
+            if predict_submitted:
+                with st.spinner("Analyzing..."):
+                    prediction = dashboard.predict_adverse_event_risk(float(patient_age), patient_sex)
+                    
+                    if prediction:
+                        import plotly.graph_objects as go
+
+                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
+                        st.markdown(f"""
+                        ### Prediction Results
+                        
+                        **Risk Level**: {prediction['risk_level']}  
+                        **Probability**: {prediction['probability']:.2%}  
+                        **Predicted Serious Event**: {'Yes' if prediction['predicted_serious'] == '1' else 'No'}
+                        
+                        *This is a predictive model for research purposes only. Always consult healthcare professionals for medical decisions.*
+                        """)
+                        st.markdown('</div>', unsafe_allow_html=True)
+                        
+                        # Visualization
+                        fig = go.Figure(go.Indicator(
+                            mode="gauge+number",
+                            value=prediction['probability'] * 100,
+                            title={'text': "Adverse Event Risk Score"},
+                            gauge={
+                                'axis': {'range': [None, 100]},
+                                'bar': {'color': "darkred" if prediction['probability'] > 0.5 else "green"},
+                                'steps': [
+                                    {'range': [0, 30], 'color': "lightgreen"},
+                                    {'range': [30, 70], 'color': "yellow"},
+                                    {'range': [70, 100], 'color': "lightcoral"}
+                                ],
+                                'threshold': {
+                                    'line': {'color': "red", 'width': 4},
+                                    'thickness': 0.75,
+                                    'value': 50
+                                }
+                            }
+                        ))
+                        st.plotly_chart(fig, use_container_width=True)
+    
+    # Tab 3: Semantic Search with Vertex AI Embeddings
+    with tabs[2]:
+        st.header("🔍 Semantic Search")
+        st.markdown('<span class="ai-badge">Vertex AI Embeddings</span>', unsafe_allow_html=True)
+        
+        st.info("Search drugs using natural language. The AI understands meaning, not just keywords!")
+        
+        with st.form('semantic_search_form'):
+            search_query = st.text_input(
+                "Search Query",
+                placeholder="e.g., drugs causing heart problems, medications with respiratory side effects"
+            )
+
+            top_k = st.slider("Number of results", min_value=3, max_value=10, value=5)
+
+            search_submitted = st.form_submit_button("🔎 Semantic Search", type="primary")
+
+        if search_submitted:
+            if search_query:
+                with st.spinner("Performing AI-powered semantic search..."):
+                    results = dashboard.semantic_search_drugs(search_query, top_k=top_k)
+                    
+                    if not results.empty:
+                        st.success(f"Found {len(results)} relevant results")
+                        
+                        # itertuples avoids building a Series per row
+                        result_cols = ['drug_name', 'event_count', 'similarity_score']
+                        for drug, events, similarity in \
+                                results[result_cols].itertuples(index=False, name=None):
+                            st.markdown(f"""
+                            <div class="insight-box">
+                            <h4>{drug}</h4>
+                            <p><strong>Similarity Score:</strong> {similarity * 100:.1f}%</p>
+                            <p><strong>Adverse Event Count:</strong> {events:,}</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                    else:
+                        st.warning("No results found. Try a different query.")
+    
+    # Tab 4: NLP Analysis with Natural Language API
+    with tabs[3]:
+        st.header("🧠 NLP Analysis")
+        st.markdown('<span class="ai-badge">Natural Language API</span>', unsafe_allow_html=True)
+        
+        st.info("Extract entities and analyze sentiment from adverse event reports or drug descriptions.")
+        
+        with st.form('nlp_form'):
+            text_input = st.text_area(
+                "Enter text to analyze",
+                placeholder="Paste adverse event description, drug label excerpt, or any relevant text...",
+                height=150
+            )
+            nlp_submitted = st.form_submit_button("🧪 Analyze Text", type="primary")
+
+        if nlp_submitted:
+            if text_input:
+                with st.spinner("Analyzing with Google Natural Language AI..."):
+                    analysis = dashboard.analyze_sentiment_and_entities(text_input)
+                    
+                    if 'error' not in analysis:
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            st.subheader("😊 Sentiment Analysis")
+                            sentiment = analysis['sentiment']
+                            
+                            sentiment_label, sentiment_color = _classify_sentiment(sentiment['score'])
+                            
+                            st.markdown(f"""
+                            <div class="metric-card">
+                            <p><strong>Sentiment:</strong> <span style="color: {sentiment_color};">{sentiment_label}</span></p>
+                            <p><strong>Score:</strong> {sentiment['score']:.2f} (-1 to 1)</p>
+                            <p><strong>Magnitude:</strong> {sentiment['magnitude']:.2f}</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        
+                        with col2:
+                            st.subheader("🏷️ Extracted Entities")
+                            
+                            if analysis['entities']:
+                                # st.dataframe takes the list of dicts
+                                # directly; no pandas round-trip needed
+                                st.dataframe(analysis['entities'], use_container_width=True)
+                            else:
+                                st.info("No entities found")
+                    else:
+                        st.error(f"Analysis error: {analysis['error']}")
+    
+    # Tab 5: Translation with Translation API
+    with tabs[4]:
+        st.header("🌐 Multi-Language Translation")
+        st.markdown('<span class="ai-badge">Translation API</span>', unsafe_allow_html=True)
+        
+        st.info("Translate drug safety information into 100+ languages for global accessibility.")
+        
+        with st.form('translate_form'):
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                text_to_translate = st.text_area(
+                    "Text to Translate",
+                    placeholder="Enter drug information, safety warnings, or insights...",
+                    height=150
+                )
+
+            with col2:
+                target_lang = st.selectbox(
+                    "Target Language",
+                    options=_LANGS,
+                    format_func=_lang_fmt
+                )
+
+            translate_submitted = st.form_submit_button("🌍 Translate", type="primary")
+
+        if translate_submitted:
+            if text_to_translate:
+                with st.spinner(f"Translating to {target_lang[1]}..."):
+                    translated = dashboard.translate_text(text_to_translate, target_lang[0])
+                    
+                    st.markdown('<div class="success-box">', unsafe_allow_html=True)
+                    st.markdown(f"### Translation ({target_lang[1]})")
+                    st.markdown(translated)
+                    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Tab 6: Voice Interface
+    with tabs[5]:
+        st.header("🎤 Voice Interface")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🎙️ Speech-to-Text")
+            st.markdown('<span class="ai-badge">Speech-to-Text</span>', unsafe_allow_html=True)
+            st.info("Upload audio file to transcribe your query.")
+            
+            with st.form('transcribe_form'):
+                audio_file = st.file_uploader("Upload Audio File (WAV)", type=['wav'])
+                transcribe_submitted = st.form_submit_button("📝 Transcribe")
+
+            if audio_file and transcribe_submitted:
+                with st.spinner("Transcribing..."):
+                    transcript = dashboard.transcribe_audio(audio_file)
+                    st.success("Transcription complete!")
+                    st.text_area("Transcript", transcript, height=100)
+        
+        with col2:
+            st.subheader("🔊 Text-to-Speech")
+            st.markdown('<span class="ai-badge">Text-to-Speech</span>', unsafe_allow_html=True)
+            st.info("Convert text insights to speech.")
+            
+            with st.form('tts_form'):
+                tts_text = st.text_area("Text to Speak", placeholder="Enter text...", height=100)
+                tts_submitted = st.form_submit_button("🎵 Generate Speech")
+
+            if tts_submitted:
+                if tts_text:
+                    with st.spinner("Synthesizing speech..."):
+                        audio_content = dashboard.synthesize_speech(tts_text)
+                        
+                        if audio_content:
+                            # st.audio serves the raw bytes with range
+                            # requests instead of a base64 data URL
+                            st.audio(audio_content, format='audio/mp3')
+
+                            # Download button
+                            st.download_button(
+                                label="📥 Download Audio",
+                                data=audio_content,
+                                file_name="insight_audio.mp3",
+                                mime="audio/mp3"
+                            )
+    
+    # Tab 7: AI Insights (Enhanced)
+    with tabs[6]:
+        st.header("🤖 AI-Powered Insights")
+        st.markdown('<span class="ai-badge">Vertex AI Gemini</span>', unsafe_allow_html=True)
+        
+        # Question answering
+        st.subheader("💬 Ask Questions About FDA Data")
+        
+        with st.form('insight_form'):
+            user_question = st.text_input(
+                "What would you like to know?",
+                placeholder="e.g., What are the emerging drug safety trends? Which drugs require enhanced monitoring?"
+            )
+            insight_submitted = st.form_submit_button("🔍 Get AI Insight", type="primary")
+
+        if insight_submitted:
+            if user_question:
+                with st.spinner("Analyzing data with Gemini AI..."):
+                    # Both aggregates are independent BQ calls; overlap
+                    # them instead of paying two round-trips in series
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        summary_future = _submit_with_ctx(executor, dashboard.get_adverse_events_summary)
+                        top_future = _submit_with_ctx(executor, dashboard.get_top_drugs_by_events)
+                        summary = summary_future.result()
+                        top_drugs = top_future.result()
+                    
+                    data_summary = f"""
+                    Total Events: {summary['total_events'].iloc[0] if not summary.empty else 0}
+                    Serious Events: {summary['serious_events'].iloc[0] if not summary.empty else 0}
+                    Deaths: {summary['deaths'].iloc[0] if not summary.empty else 0}
+                    
+                    Top Drugs by Events:
+                    {top_drugs.to_string() if not top_drugs.empty else 'No data'}
+                    """
+                    
+                    # Stream tokens into the page as they arrive
+                    st.markdown('<div class="insight-box">', unsafe_allow_html=True)
+                    st.markdown("### 💡 AI Insight")
+                    insight = st.write_stream(dashboard.stream_with_gemini(data_summary, user_question))
+                    st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    # Add text-to-speech option
+                    if st.button("🔊 Listen to Insight"):
+                        with st.spinner("Converting to speech..."):
+                            audio = dashboard.synthesize_speech_long(insight)
+                            if audio:
+                                st.audio(audio, format='audio/mp3', autoplay=True)
+        
+        st.markdown("---")
+        
+        # Drug-specific analysis
+        st.subheader("💊 Drug Safety Analysis")
+        
+        with st.form('drug_analysis_form'):
+            drug_name = st.text_input("Enter drug name for detailed safety analysis")
+            drug_submitted = st.form_submit_button("📊 Analyze Drug", type="secondary")
+
+        if drug_submitted:
+            if drug_name:
+                with st.spinner(f"Analyzing {drug_name}..."):
+                    query = f"""
+                    SELECT 
+                        reactions,
+                        serious,
+                        serious_death,
+                        serious_hospitalization,
+                        patient_sex,
+                        patient_age
+                    FROM `{dashboard.project_id}.{dashboard.dataset_id}.fda_drug_adverse_events`
+                    WHERE SEARCH(drug_names, @drug)
+                    LIMIT 100
+                    """
+
+                    # SEARCH rides the drug_names_idx index instead of a
+                    # per-row LOWER() LIKE scan; the parameter keeps the
+                    # SQL text stable for BigQuery's result cache
+                    drug_data = dashboard.query_bigquery(query, params=(
+                        ("drug", "STRING", drug_name.lower().strip()),
+                    ))
+                    
+                    if not drug_data.empty:
+                        st.markdown('<div class="warning-box">', unsafe_allow_html=True)
+                        st.markdown(f"### ⚠️ Comprehensive Safety Analysis: {drug_name}")
+                        st.write_stream(dashboard.stream_safety_recommendations(drug_name, drug_data))
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    else:
+                        st.warning(f"No data found for {drug_name}")
+    
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: #666;'>
+        <p><strong>Built for the Fivetran × Google Cloud Challenge 2024</strong></p>
+        <p>Powered by 8 Google Cloud AI Services | Data source: openFDA</p>
+        <p>🧬 BigQuery ML | 🔍 Vertex AI Embeddings | 🧠 Natural Language API | 🌐 Translation API</p>
+        <p>🎤 Speech-to-Text | 🔊 Text-to-Speech | 🤖 Vertex AI Gemini</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    main()
+